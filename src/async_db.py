@@ -0,0 +1,61 @@
+import asyncio
+import functools
+import inspect
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import db_manager
+import identity_cache
+
+# db_manager의 비동기 버전
+# 모든 쿼리를 전용 db 스레드에서 실행하므로 SQLite 쓰기나 WAL 체크포인트가 디스코드 이벤트 루프를 멈추지 않는다
+# db_manager와 함수 이름/인자가 같고, 호출할 때 await만 붙이면 된다
+#
+#   import async_db as db
+#   group_id = await db.get_group_id(server_id, channel_id)
+
+# SQLite는 쓰기를 하나씩만 처리하므로 기본은 스레드 하나
+DB_WORKERS = int(os.getenv("SOL2_DB_WORKERS", "1"))
+# 대기 중인 쿼리가 이만큼 쌓이면 새 요청은 이벤트 루프에서 자리가 날 때까지 기다린다
+DB_QUEUE_SIZE = int(os.getenv("SOL2_DB_QUEUE_SIZE", "64"))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="sol2-db")
+_queue_slots: asyncio.Semaphore|None = None
+
+def _get_queue_slots() -> asyncio.Semaphore:
+    global _queue_slots
+    if _queue_slots is None:
+        _queue_slots = asyncio.Semaphore(DB_QUEUE_SIZE)
+    return _queue_slots
+
+# db 스레드에서 함수 실행
+async def run(func, *args, **kwargs):
+    async with _get_queue_slots():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+# 식별 캐시가 채워져 있으면 SQL을 쓰지 않는 조회 함수 (db 스레드를 거치지 않고 바로 실행)
+CACHED_READS = {
+    "get_solvedac_handle", "is_user", "is_registered_user",
+    "get_group_id", "get_group_name", "get_group_manager", "get_channel_id"
+}
+
+def _make_async(func):
+    cached = func.__name__ in CACHED_READS
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if cached and identity_cache.is_loaded():
+            return func(*args, **kwargs)
+        return await run(func, *args, **kwargs)
+    return wrapper
+
+# db_manager의 공개 함수를 모두 같은 이름의 비동기 함수로 만든다
+for _name, _func in inspect.getmembers(db_manager, inspect.isfunction):
+    if _func.__module__ == db_manager.__name__ and not _name.startswith("_"):
+        globals()[_name] = _make_async(_func)
+
+# 봇 종료 시 db 스레드의 연결을 닫고 스레드 정리
+async def close():
+    await run(db_manager.close_db_connections)
+    _executor.shutdown(wait=False)
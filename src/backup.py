@@ -0,0 +1,156 @@
+import argparse
+import datetime
+import glob
+import os
+import sqlite3
+import time
+
+import db_manager as db
+
+# 봇 실행 중에도 안전한 db 백업 (SQLite 온라인 백업 API)
+# 파일을 그대로 복사하면 WAL 파일과 어긋난 반쪽짜리 사본이 생길 수 있으므로
+# 페이지를 조금씩 복사하고 단계 사이에 쉬어서 봇의 쓰기가 오래 기다리지 않게 한다
+#
+#   python backup.py create                        # 지금 백업
+#   python backup.py list
+#   python backup.py restore backups/sol2-20250101-043000.db   # 봇을 끈 상태에서 실행
+
+BACKUP_DIR = os.getenv("SOL2_BACKUP_DIR", "backups")
+# 최근 백업을 이만큼 남기고 오래된 것부터 지운다
+BACKUP_KEEP = int(os.getenv("SOL2_BACKUP_KEEP", "7"))
+# 한 단계에 복사할 페이지 수와 단계 사이에 쉴 시간(초)
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.05
+# 다른 연결이 db에 쓰면 백업이 처음부터 다시 시작된다
+# 이만큼 다시 시작되면 쉬지 않고 한 번에 복사한다 (WAL에서는 한 번에 복사해도 쓰기를 막지 않는다)
+BACKUP_MAX_RESTARTS = 3
+
+BACKUP_PREFIX = "sol2-"
+
+class _BackupRestarted(Exception):
+    pass
+
+def _integrity_ok(con) -> bool:
+    result = con.execute("PRAGMA integrity_check").fetchall()
+    return len(result) == 1 and result[0][0] == "ok"
+
+# 백업 파일 무결성 확인
+def verify_backup(path: str) -> bool:
+    try:
+        con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return False
+    try:
+        return _integrity_ok(con)
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        con.close()
+
+# 백업 파일 목록 (오래된 것부터)
+def list_backups(directory: str|None = None) -> list:
+    directory = directory or BACKUP_DIR
+    return sorted(glob.glob(os.path.join(directory, f"{BACKUP_PREFIX}*.db")))
+
+def _rotate(directory: str, keep: int) -> list:
+    backups = list_backups(directory)
+    removed = backups[:-keep] if keep > 0 else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+# 현재 db를 백업하고 통계를 반환 ({"path", "pages", "seconds", "pages_per_second", "removed"})
+# 복사가 끝난 사본의 무결성을 확인한 뒤에만 백업 이름으로 바꾸므로 실패한 백업이 목록에 남지 않는다
+def create_backup(directory: str|None = None, keep: int|None = None) -> dict:
+    directory = directory or BACKUP_DIR
+    keep = BACKUP_KEEP if keep is None else keep
+    os.makedirs(directory, exist_ok=True)
+
+    name = f"{BACKUP_PREFIX}{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.db"
+    path = os.path.join(directory, name)
+    tmp_path = path + ".tmp"
+
+    total_pages = 0
+    last_remaining = None
+    restarts = 0
+    def on_progress(status, remaining, total):
+        nonlocal total_pages, last_remaining, restarts
+        total_pages = total
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts >= BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        last_remaining = remaining
+        if remaining:
+            time.sleep(BACKUP_STEP_SLEEP)
+
+    started = time.perf_counter()
+    # 봇이 쓰는 스레드별 연결과 따로 연결해서 db 스레드를 붙잡지 않는다
+    source = sqlite3.connect(db.DATABASE_FILE)
+    target = sqlite3.connect(tmp_path)
+    try:
+        try:
+            source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=on_progress)
+        except _BackupRestarted:
+            print(f"db 백업이 {restarts}번 다시 시작되어 한 번에 복사합니다.")
+            source.backup(target)
+        if not _integrity_ok(target):
+            raise sqlite3.DatabaseError(f"백업 무결성 검사 실패: {tmp_path}")
+    except Exception:
+        target.close()
+        os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+    os.replace(tmp_path, path)
+    seconds = time.perf_counter() - started
+
+    stats = {
+        "path": path,
+        "pages": total_pages,
+        "seconds": seconds,
+        "pages_per_second": total_pages / seconds if seconds > 0 else 0.0,
+        "removed": _rotate(directory, keep)
+    }
+    print(f"db 백업 완료: {path} ({stats['pages']}페이지, {seconds:.2f}초, {stats['pages_per_second']:.0f}페이지/초)")
+    return stats
+
+# 백업으로 현재 db를 덮어쓰기 (봇을 끈 상태에서 실행)
+def restore_backup(path: str):
+    if not verify_backup(path):
+        raise ValueError(f"무결성 검사를 통과하지 못한 백업입니다: {path}")
+
+    started = time.perf_counter()
+    db.close_db_connections()
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    target = sqlite3.connect(db.DATABASE_FILE)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    print(f"db 복원 완료: {path} -> {db.DATABASE_FILE} ({time.perf_counter() - started:.2f}초)")
+
+def main():
+    parser = argparse.ArgumentParser(description="db 백업 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser("create", help="지금 백업")
+    create_parser.add_argument("--dir", default=BACKUP_DIR)
+    list_parser = subparsers.add_parser("list", help="백업 목록")
+    list_parser.add_argument("--dir", default=BACKUP_DIR)
+    restore_parser = subparsers.add_parser("restore", help="백업으로 db 복원 (봇을 끈 상태에서)")
+    restore_parser.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        create_backup(args.dir)
+    elif args.command == "list":
+        for path in list_backups(args.dir):
+            status = "ok" if verify_backup(path) else "손상됨"
+            print(f"{path}\t{os.path.getsize(path) / 1024:.0f}KB\t{status}")
+    elif args.command == "restore":
+        restore_backup(args.path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import db_manager as db
+
+# db_manager 함수 호출 한 번당 걸리는 시간 비교
+#   before: 호출마다 새 연결을 열고 PRAGMA를 다시 실행 (이전 get_db_connection 방식)
+#   after : 스레드마다 연결 하나를 재사용 (현재 get_db_connection)
+#
+#   python bench_db.py --calls 5000
+
+def _connect_per_call():
+    con = sqlite3.connect(db.DATABASE_FILE)
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA foreign_keys = ON")
+    con.execute("PRAGMA journal_mode = WAL")
+    return con
+
+def _prepare_data():
+    db.init_db()
+    for i in range(100):
+        db.register_user(i, f"user{i}")
+        db.create_group(f"group{i}", 1, i, i)
+    group_id = db.get_group_id(1, 0)
+    db.create_problem_set(group_id, "set")
+    set_id = db.get_set_id(group_id, "set")
+    for problem_id in range(1000, 1050):
+        db.add_problem(set_id, problem_id)
+    db.insert_user_top100("user0", list(range(1000, 1100)))
+
+# 그룹 채널 명령어가 실제로 부르는 조합 (/그룹정보 등)
+def _workload():
+    group_id = db.get_group_id(1, 0)
+    db.get_group_name(group_id)
+    db.get_group_manager(group_id)
+    db.get_solvedac_handle(0)
+    db.get_user_top100("user0")
+
+def _measure(calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        _workload()
+    return (time.perf_counter() - started) / (calls * 5) * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description="db_manager 연결 관리 벤치마크")
+    parser.add_argument("--calls", type=int, default=5000, help="반복 횟수 (한 번에 db 함수 5개 호출)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DATABASE_FILE = os.path.join(tmp_dir, "bench.db")
+        _prepare_data()
+
+        original = db.get_db_connection
+        db.get_db_connection = _connect_per_call
+        try:
+            before = _measure(args.calls)
+        finally:
+            db.get_db_connection = original
+
+        _workload()  # 연결과 준비된 쿼리를 미리 만들어 둔다
+        after = _measure(args.calls)
+        db.close_db_connections()
+
+    print(f"before (호출마다 연결): {before:8.1f} us/call")
+    print(f"after  (연결 재사용)  : {after:8.1f} us/call")
+    print(f"{before / after:.1f}x faster")
+
+if __name__ == "__main__":
+    main()
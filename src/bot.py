@@ -4,24 +4,58 @@ from discord import app_commands
 import os
 from dotenv import load_dotenv
 import datetime
+import asyncio
 from typing import Optional
 
-import db_manager as db
+import async_db as db
 import solved_ac_api as api
+import metrics
+import problem_catalog
+import name_index
+import identity_cache
+import backup
+import sync_scheduler
+from pagination import PaginatedView
 
 load_dotenv()
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+# Prometheus textfile 수집기가 읽어 갈 지표 스냅샷 파일
+METRICS_FILE = os.getenv("SOL2_METRICS_FILE", "sol2_metrics.prom")
+# /라이벌도전장, /푼문제 한 페이지에 보여 줄 문제 수
+RIVAL_CHALLENGE_PAGE_SIZE = 30
+SOLVED_PROBLEMS_PAGE_SIZE = 30
+# /문제집문제보기 한 페이지에 보여 줄 문제 수 (문제마다 필드 하나, 임베드 필드는 최대 25개)
+SET_PROBLEMS_PAGE_SIZE = 10
+# 명령어에서 받는 백준 문제 번호 상한 (실제 문제 번호는 4만 아래)
+MAX_PROBLEM_ID = 999999
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="/", intents=intents)
+class Sol2Bot(commands.Bot):
+    # 로그인 전에 solved.ac HTTP 세션을 열어 둔다
+    async def setup_hook(self):
+        await api.open_session()
+        write_metrics_snapshot.start()
+
+    # 봇 종료 시 HTTP 세션도 함께 닫는다
+    async def close(self):
+        write_metrics_snapshot.cancel()
+        daily_update.cancel()
+        daily_backup.cancel()
+        sync_solved_problems.cancel()
+        await api.close_session()
+        await super().close()
+        await db.close()
+
+bot = Sol2Bot(command_prefix="/", intents=intents)
 
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user}")
-    db.init_db()
+    await db.init_db()
+    await db.build_name_index()
     
     try:
         synced = await bot.tree.sync()
@@ -29,7 +63,13 @@ async def on_ready():
     except Exception as e:
         print(f"Sync Error: {e}")
 
-    daily_update.start()
+    if not daily_update.is_running():
+        daily_update.start()
+    # 재시작 전에 끝나지 않은 동기화가 있으면 첫 실행에서 이어서 한다
+    if not sync_solved_problems.is_running():
+        sync_solved_problems.start()
+    if not daily_backup.is_running():
+        daily_backup.start()
 
 # 봇 길드 참가 이벤트
 @bot.event
@@ -77,6 +117,8 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
             f"서버 설정에서 봇에게 다음 권한을 부여해주세요: **{missing_perms}**", 
             ephemeral=True
         )
+    elif isinstance(error, app_commands.CheckFailure):
+        await send_func("이 명령어를 사용할 권한이 없습니다.", ephemeral=True)
     else:
         await interaction.followup.send(f"오류가 발생했습니다: {error}", ephemeral=True)
 
@@ -98,12 +140,13 @@ async def help(interaction: discord.Interaction):
     "**/문제집보기**: 그룹장이 생성한 모든 문제집을 출력합니다.\n"
     "**/문제집문제** (추가/삭제) {set_name} {problem_id}: (권한 필요)문제집의 문제 관련 명령어를 실행합니다.\n"
     "**/문제집문제보기** {set_name}: 문제집의 문제들을 출력합니다.\n"
+    "**/진행도** [member]: (그룹 채널 전용)그룹원의 문제집별 진행도를 출력합니다.\n"
     "**/문제** {problem_id}: 백준 문제 정보를 출력합니다.\n"
     "**/푼문제** {solvedac_id}: 푼 문제를 출력합니다.\n"
     "**/라이벌** (추가/삭제) {rival_id}: 라이벌 관련 명령어를 실행합니다.\n"
     "**/라이벌목록**: 당신이 설정한 라이벌 목록을 출력합니다.\n"
     "**/역라이벌목록**: 당신을 라이벌로 설정한 사람들의 목록을 출력합니다.\n"
-    "**/라이벌도전장** {rival_id}: 라이벌이 푼 문제 중 내가 못 푼 문제를 출력합니다.\n"
+    "**/라이벌도전장** {rival_id} [page] [sort]: 라이벌이 푼 문제 중 내가 못 푼 문제를 출력합니다.\n"
     )
     embed = discord.Embed(
         title=f"/도움",
@@ -117,6 +160,29 @@ def is_guild_owner():
         return interaction.guild is not None and interaction.user.id == interaction.guild.owner_id
     return app_commands.check(predicate)
 
+def is_bot_owner():
+    async def predicate(interaction: discord.Interaction) -> bool:
+        return await bot.is_owner(interaction.user)
+    return app_commands.check(predicate)
+
+# ==================== 자동 완성 ==================== #
+# 메모리 접두어 색인에서 바로 찾으므로 db를 거치지 않는다
+
+# 현재 그룹 채널의 문제집 이름
+async def set_name_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    group_id = identity_cache.get_group_id(interaction.guild_id, interaction.channel_id)
+    if group_id is None:
+        return []
+    return [app_commands.Choice(name=name, value=name) for name in name_index.set_names.search(group_id, current)]
+
+# Sol2에 등록된 solved.ac 핸들
+async def handle_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return [app_commands.Choice(name=handle, value=handle) for handle in name_index.handles.search(None, current)]
+
+# 현재 서버의 그룹 이름
+async def group_name_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    return [app_commands.Choice(name=name, value=name) for name in name_index.group_names.search(interaction.guild_id, current)]
+
 # /그룹장 (부여/제거) {Member}
 @bot.tree.command(name="그룹장", description="(서버장 전용)그룹장 역할을 부여합니다.")
 @app_commands.choices(action=[
@@ -173,22 +239,22 @@ async def register_Sol2(interaction: discord.Interaction, solvedac_id: str):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        is_registered = db.is_registered_user(interaction.user.id)
+        is_registered = await db.is_registered_user(interaction.user.id)
         if is_registered:
-            solvedac_handle = db.get_solvedac_handle(interaction.user.id)
+            solvedac_handle = await db.get_solvedac_handle(interaction.user.id)
             await interaction.followup.send(f"이미 가입되어 있습니다. id: {solvedac_handle}")
             return
         user_info = await api.get_user_info(solvedac_id)
         if not user_info:
             await interaction.followup.send(f"{solvedac_id} 계정을 찾을 수 없습니다.", ephemeral=True)
             return
-        db.register_user(interaction.user.id, solvedac_id)
+        await db.register_user(interaction.user.id, solvedac_id)
 
         top100_list = await get_user_top100_from_api(solvedac_id)
         if not top100_list:
             await interaction.followup.send("등록은 완료되었으나 문제 목록을 불러오지 못했습니다.", ephemeral=True)
             return
-        db.insert_user_top100(solvedac_id, top100_list)
+        await db.insert_user_top100(solvedac_id, top100_list)
         await interaction.followup.send(f"{solvedac_id}로 성공적으로 등록되었습니다!")
     except Exception as e:
         await interaction.followup.send(f"등록에 실패하였습니다.", ephemeral=True)
@@ -203,6 +269,7 @@ async def register_Sol2(interaction: discord.Interaction, solvedac_id: str):
     app_commands.Choice(name="생성", value="create"),
     app_commands.Choice(name="삭제", value="delete"),
 ])
+@app_commands.autocomplete(group_name=group_name_autocomplete)
 @app_commands.checks.has_role("Sol2_Manager")
 async def group_command(interaction: discord.Interaction, action: app_commands.Choice[str], group_name: str):
     await interaction.response.defer(ephemeral=True)
@@ -221,7 +288,7 @@ async def group_command(interaction: discord.Interaction, action: app_commands.C
                 topic=f"Sol2 {group_name} 그룹 채널입니다. 그룹장: <@{group_manager_id}>"
             )
             
-            success = db.create_group(
+            success = await db.create_group(
                 group_name=group_name,
                 server_id=interaction.guild_id,
                 channel_id=new_channel.id,
@@ -229,13 +296,13 @@ async def group_command(interaction: discord.Interaction, action: app_commands.C
             )
 
             if success:
-                group_manager_solvedac_id = db.get_solvedac_handle(group_manager_id)
+                group_manager_solvedac_id = await db.get_solvedac_handle(group_manager_id)
                 if group_manager_solvedac_id is None:
                     return
-                group_id = db.get_group_id(interaction.guild_id, new_channel.id)
+                group_id = await db.get_group_id(interaction.guild_id, new_channel.id)
                 if group_id is None:
                     return
-                db.add_group_member(group_manager_id,group_manager_solvedac_id,group_id)
+                await db.add_group_member(group_manager_id,group_manager_solvedac_id,group_id)
 
                 embed = discord.Embed(
                     title=f"{group_name} 채팅방에 오신 것을 환영합니다!",
@@ -257,7 +324,7 @@ async def group_command(interaction: discord.Interaction, action: app_commands.C
 
     # /그룹 삭제 {group_name}
     elif action.value == "delete":
-        success = db.delete_group(group_name, interaction.user.id)
+        success = await db.delete_group(group_name, interaction.user.id)
 
         if success:
             await interaction.followup.send(
@@ -272,14 +339,14 @@ async def group_info(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send(f"그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
 
-    group_name = db.get_group_name(group_id)
-    manager_id = db.get_group_manager(group_id)
-    members = db.get_member(group_id) or []
+    group_name = await db.get_group_name(group_id)
+    manager_id = await db.get_group_manager(group_id)
+    members = await db.get_member(group_id) or []
 
     embed = discord.Embed(
         title=f"그룹 정보: {group_name}",
@@ -306,17 +373,17 @@ async def member_command(interaction: discord.Interaction, action: app_commands.
     await interaction.response.defer(ephemeral=True)
 
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send(f"그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
 
-    group_name = db.get_group_name(group_id)
+    group_name = await db.get_group_name(group_id)
     if not group_id:
         await interaction.followup.send(f"**{group_name}** 그룹이 존재하지 않습니다.", ephemeral=True)
         return
 
-    solvedac_id = db.get_solvedac_handle(interaction.user.id)
+    solvedac_id = await db.get_solvedac_handle(interaction.user.id)
     if not solvedac_id:
         await interaction.followup.send(f"db에 사용자님의 정보를 찾을 수가 없습니다. 등록을 안했다면 /등록 을 해주세요.")
         return
@@ -324,9 +391,9 @@ async def member_command(interaction: discord.Interaction, action: app_commands.
     # /그룹원 참가
     if action.value == "join":
         try:
-            success = db.add_group_member(interaction.user.id, solvedac_id, group_id)
+            success = await db.add_group_member(interaction.user.id, solvedac_id, group_id)
             if success:
-                channel_id = db.get_channel_id(group_id)
+                channel_id = await db.get_channel_id(group_id)
                 if channel_id:
                     channel = bot.get_channel(int(channel_id))
                     if isinstance(channel, discord.TextChannel):
@@ -340,7 +407,7 @@ async def member_command(interaction: discord.Interaction, action: app_commands.
     
     # /그룹원 탈퇴
     elif action.value == "leave":
-        success = db.delete_member(interaction.user.id, group_id)
+        success = await db.delete_member(interaction.user.id, group_id)
         if success:
             await interaction.followup.send(f"**{group_name}** 그룹에서 탈퇴했습니다.", ephemeral=True)
         else:
@@ -348,7 +415,7 @@ async def member_command(interaction: discord.Interaction, action: app_commands.
 
     # /그룹원 정보
     elif action.value == "info":
-        members = db.get_member(group_id)
+        members = await db.get_member(group_id)
         if not members:
             await interaction.followup.send("해당 그룹에 그룹원이 없습니다.", ephemeral=True)
             return
@@ -373,17 +440,18 @@ async def member_command(interaction: discord.Interaction, action: app_commands.
     app_commands.Choice(name="생성", value="create"),
     app_commands.Choice(name="삭제", value="delete"),
 ])
+@app_commands.autocomplete(set_name=set_name_autocomplete)
 @app_commands.checks.has_role("Sol2_Manager")
 async def problem_set_command(interaction: discord.Interaction, action: app_commands.Choice[str], set_name: str):
     await interaction.response.defer(ephemeral=True)
     
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send(f"그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
 
-    group_name = db.get_group_name(group_id)
+    group_name = await db.get_group_name(group_id)
 
     if not group_id:
         await interaction.followup.send(f"**{group_name}** 그룹이 존재하지 않습니다.", ephemeral=True)
@@ -394,7 +462,7 @@ async def problem_set_command(interaction: discord.Interaction, action: app_comm
         group_manager_id = interaction.user.id
 
         try:
-            success = db.create_problem_set(group_id, set_name)
+            success = await db.create_problem_set(group_id, set_name)
             if success:
                 await interaction.followup.send(f"**{set_name}** 문제집이 생성되었습니다.")
             else:
@@ -406,7 +474,7 @@ async def problem_set_command(interaction: discord.Interaction, action: app_comm
 
     # /문제집 삭제 {set_name}
     if action.value == "delete":
-        success = db.delete_problem_set(group_id, set_name)
+        success = await db.delete_problem_set(group_id, set_name)
         if success:
             await interaction.followup.send(f"**{set_name}** 문제집이 삭제되었습니다.")
         else:
@@ -418,17 +486,17 @@ async def get_problem_sets(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send(f"그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
-    group_name = db.get_group_name(group_id)
+    group_name = await db.get_group_name(group_id)
     if not group_id:
         await interaction.followup.send(f"**{group_name}** 그룹을 찾을 수 없습니다.", ephemeral=True)
         return
     
-    manager_id = db.get_group_manager(group_id)
-    problem_sets = db.get_problem_set(group_id)
+    manager_id = await db.get_group_manager(group_id)
+    problem_sets = await db.get_problem_set(group_id)
     if not problem_sets:
         await interaction.followup.send(f"문제집이 없습니다. 문제집이 필요하다면 <@{manager_id}> 그룹장에게 요청하세요.", ephemeral=True)
         return
@@ -447,85 +515,147 @@ async def get_problem_sets(interaction: discord.Interaction):
 
 # ==================== 문제 관련 봇 명령어 ==================== #
 
+# 문제 번호 자동 완성 (로컬 문제 목록에서 검색하므로 네트워크 요청 없음)
+async def problem_id_autocomplete(interaction: discord.Interaction, current: str) -> list:
+    try:
+        results = await db.search_problems(current, limit=25)
+    except Exception as e:
+        print(f"problem_id_autocomplete Error: {e}")
+        return []
+    return [app_commands.Choice(name=f"{problem_id} {title}"[:100], value=problem_id) for problem_id, title in results]
+
 # /문제집문제 (추가/삭제) {set_name} {problem_id}
 @bot.tree.command(name="문제집문제", description="(권한 필요)문제집의 문제 관련 명령어를 실행합니다.")
 @app_commands.choices(action=[
     app_commands.Choice(name="추가", value="insert"),
     app_commands.Choice(name="삭제", value="delete")
 ])
+@app_commands.autocomplete(set_name=set_name_autocomplete, problem_id=problem_id_autocomplete)
 @app_commands.checks.has_role("Sol2_Manager")
-async def problem_command(interaction: discord.Interaction, action: app_commands.Choice[str], set_name:str, problem_id: int):
+async def problem_command(interaction: discord.Interaction, action: app_commands.Choice[str], set_name:str, problem_id: app_commands.Range[int, 1, MAX_PROBLEM_ID]):
     await interaction.response.defer(ephemeral=True)
 
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send(f"그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
     
-    set_id = db.get_set_id(group_id, set_name)
+    set_id = await db.get_set_id(group_id, set_name)
     if set_id is None:
         await interaction.followup.send(f"입력하신 문제집이 존재하지 않습니다.", ephemeral=True)
         return
     
     # /문제집문제 추가 {set_name} {problem_num}
     if action.value == "insert":
-        db.add_problem(set_id, problem_id)
+        await db.add_problem(set_id, problem_id)
         await interaction.followup.send(f"{set_name}에 {problem_id} 문제를 추가했습니다.")
 
     # /문제집문제 삭제 {set_name} {problem_num}
     if action.value == "delete":
-        db.delete_problem(set_id, problem_id)
+        await db.delete_problem(set_id, problem_id)
         await interaction.followup.send(f"{set_name}의 {problem_id} 문제를 삭제하였습니다.")
 
 # /문제집문제보기 {set_name}
 @bot.tree.command(name="문제집문제보기", description="문제집의 문제들을 출력합니다.")
+@app_commands.autocomplete(set_name=set_name_autocomplete)
 async def get_set_problems(interaction: discord.Interaction, set_name: str):
     await interaction.response.defer(ephemeral=True)
 
     channel_id = interaction.channel_id
-    group_id = db.get_group_id(interaction.guild_id, channel_id)
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
     if group_id is None:
         await interaction.followup.send("그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
         return
 
-    set_id = db.get_set_id(group_id, set_name)
+    set_id = await db.get_set_id(group_id, set_name)
     if not set_id:
         await interaction.followup.send(f"**{set_name}** 문제집을 찾을 수 없습니다.", ephemeral=True)
         return
 
-    embed = discord.Embed(title=f"{set_name}", description="문제 목록")
-
-    def get_problem_name(json_data: dict) -> str:
-        try:
-            return json_data.get('titleKo') or json_data.get('title') or "제목없음"
-        except Exception:
-            return "제목읽기실패"
-        
-    problems = db.get_problem(set_id)
-    if not problems:
+    problems = []
+    member_count = 0
+    progress = {}
+    group_solved = 0
+
+    async def count_pages() -> int:
+        nonlocal problems, member_count, progress, group_solved
+        problems = await db.get_problem(set_id) or []
+        group_solved = await db.count_group_solved(group_id, problems)
+        # 그룹원별로 푼 문제는 미리 계산해 둔 진행도에서 읽는다
+        progress = await db.get_set_progress(set_id)
+        member_count = len(await db.get_member(group_id) or [])
+        return (len(problems) + SET_PROBLEMS_PAGE_SIZE - 1) // SET_PROBLEMS_PAGE_SIZE
+
+    # 문제 번호와 링크는 바로 보여 주고, 제목은 가져오는 대로 채운다
+    async def render_page(page: int, page_count: int) -> discord.Embed:
+        page_problems = problems[(page - 1) * SET_PROBLEMS_PAGE_SIZE:page * SET_PROBLEMS_PAGE_SIZE]
+        await titles.load(page, page_problems)
+
+        embed = discord.Embed(title=f"{set_name} ({page}/{page_count})", description=f"문제 목록 (총 {len(problems)}문제, 그룹원이 한 명이라도 푼 문제 {group_solved}문제)")
+        for problem_id in page_problems:
+            solved_text = f"해결 {progress.get(problem_id, 0)}/{member_count}명"
+            embed.add_field(name=f"{titles.title(problem_id)} ({problem_id})", value=f"https://www.acmicpc.net/problem/{problem_id} · {solved_text}", inline=False)
+        add_offline_notice(embed)
+        return embed
+
+    view = PaginatedView(count_pages, render_page, interaction.user.id)
+    titles = ProblemTitleLoader(view)
+    if not await view.reload():
         await interaction.followup.send(f"{set_name} 문제집에 문제가 없습니다.", ephemeral=True)
         return
+    await send_paginated(interaction, view)
 
-    for problem_id in problems:
-        try:
-            problem_data = await api.get_problem_from_num(problem_id)
-            problem_name = get_problem_name(problem_data)
-            embed.add_field(name=f"{problem_name} ({problem_id})", value=f"https://www.acmicpc.net/problem/{problem_id}", inline=False)
-        except Exception as e:
-            embed.add_field(name=f"문제 {problem_id}", value=f"정보 불러오기 실패 ({e})", inline=False)
+# /진행도 [member]
+@bot.tree.command(name="진행도", description="그룹원의 문제집별 진행도를 출력합니다.")
+@app_commands.describe(member="진행도를 볼 그룹원 (기본 자신)")
+async def get_member_progress(interaction: discord.Interaction, member: Optional[discord.Member] = None):
+    await interaction.response.defer(ephemeral=True)
+
+    channel_id = interaction.channel_id
+    group_id = await db.get_group_id(interaction.guild_id, channel_id)
+    if group_id is None:
+        await interaction.followup.send("그룹 채팅 채널에서 실행해 주세요.", ephemeral=True)
+        return
+
+    target = member or interaction.user
+    solvedac_id = await db.get_solvedac_handle(target.id)
+    if not solvedac_id or not await db.is_member(solvedac_id, group_id):
+        await interaction.followup.send(f"<@{target.id}>님은 이 그룹의 그룹원이 아닙니다.", ephemeral=True)
+        return
+
+    progress = await db.get_member_progress(group_id, target.id)
+    if not progress:
+        await interaction.followup.send("문제집이 없습니다.", ephemeral=True)
+        return
+
+    embed = discord.Embed(title=f"{solvedac_id}님의 문제집 진행도")
+    for set_name, solved, total in progress:
+        embed.add_field(name=set_name, value=f"{solved}/{total} 문제 해결", inline=False)
 
     await interaction.followup.send(embed=embed, ephemeral=True)
 
 # /문제 {problem_id}
 @bot.tree.command(name="문제", description="백준 문제 정보를 출력합니다.")
-async def get_baekjoon_problem_info(interaction: discord.Interaction, problem_id: int):
+@app_commands.autocomplete(problem_id=problem_id_autocomplete)
+async def get_baekjoon_problem_info(interaction: discord.Interaction, problem_id: app_commands.Range[int, 1, MAX_PROBLEM_ID]):
     await interaction.response.defer(ephemeral=True)
 
     try:
-        baekjoon_problem_info = await api.get_problem_from_num(problem_id)
+        baekjoon_problem_info = (await api.get_problems([problem_id])).get(problem_id)
+        if baekjoon_problem_info is None:
+            await interaction.followup.send(f"{problem_id}번 문제를 찾을 수 없습니다.", ephemeral=True)
+            return
         titleKo = baekjoon_problem_info.get('titleKo') or baekjoon_problem_info.get('title') or "제목없음"
-        await interaction.followup.send(f"{titleKo} ({problem_id})", ephemeral=True)
+        message = f"{titleKo} ({problem_id})"
+
+        # 그룹 채널이면 그룹원 중 푼 사람을 함께 보여 준다
+        group_id = await db.get_group_id(interaction.guild_id, interaction.channel_id)
+        if group_id is not None:
+            member_handles = [await db.get_solvedac_handle(member_id) for member_id in await db.get_member(group_id) or []]
+            solvers = await db.get_solvers(problem_id, [handle for handle in member_handles if handle])
+            message += f"\n그룹원 중 푼 사람: {', '.join(solvers)}" if solvers else "\n그룹원 중 아직 푼 사람이 없습니다."
+        await interaction.followup.send(message, ephemeral=True)
     except Exception as e:
         await interaction.followup.send(f"문제 정보를 확인하는 데 실패했습니다. {e}", ephemeral=True)
 
@@ -533,30 +663,55 @@ async def get_baekjoon_problem_info(interaction: discord.Interaction, problem_id
 
 # /푼문제 {solvedac_id}
 @bot.tree.command(name="푼문제", description="푼 문제를 출력합니다.")
+@app_commands.autocomplete(solvedac_id=handle_autocomplete)
 async def get_solved_problems(interaction: discord.Interaction, solvedac_id: str):
     await interaction.response.defer(ephemeral=True)
 
-    isUser = db.is_user(solvedac_id)
+    isUser = await db.is_user(solvedac_id)
     if not isUser:
         await interaction.followup.send(f"{solvedac_id}는 Sol2 이용자가 아니므로, 불러올 수 없습니다.", ephemeral=True)
         return
-    
-    user_solved_problem_list = db.get_user_top100(solvedac_id)
-    if not user_solved_problem_list:
+
+    # 오래된 정보면 지금 정보로 먼저 답하고, 동기화가 끝나면 답장을 고친다
+    refresh = await sync_scheduler.refresh_if_stale(solvedac_id)
+
+    user_solved_problem_list = []
+    synced_text = ""
+
+    async def count_pages() -> int:
+        nonlocal user_solved_problem_list, synced_text
+        user_solved_problem_list = await db.get_user_top100(solvedac_id)
+        synced_text = await get_synced_text(solvedac_id)
+        return (len(user_solved_problem_list) + SOLVED_PROBLEMS_PAGE_SIZE - 1) // SOLVED_PROBLEMS_PAGE_SIZE
+
+    # 보고 있는 페이지의 문제 제목만 가져온다
+    async def render_page(page: int, page_count: int) -> discord.Embed:
+        page_problems = user_solved_problem_list[(page - 1) * SOLVED_PROBLEMS_PAGE_SIZE:page * SOLVED_PROBLEMS_PAGE_SIZE]
+        description_text = f"총 {len(user_solved_problem_list)}문제\n" + synced_text
+        await titles.load(page, page_problems)
+        for solved_problem in page_problems:
+            problem_title = titles.title(solved_problem)
+            description_text += f"[{problem_title}](https://www.acmicpc.net/problem/{solved_problem}) - {solved_problem}\n"
+
+        embed = discord.Embed(
+            title=f"푼 문제 목록 ({page}/{page_count})",
+            description=description_text
+        )
+        add_offline_notice(embed)
+        return embed
+
+    view = PaginatedView(count_pages, render_page, interaction.user.id)
+    titles = ProblemTitleLoader(view)
+    if await view.reload():
+        message = await send_paginated(interaction, view)
+    elif refresh is None:
         await interaction.followup.send(f"해당 사용자는 아직 문제를 풀지 않았습니다." , ephemeral=True)
         return
-    
-    description_text = ""
-    for solved_problem in user_solved_problem_list[:50]:
-        problem_title = await get_baekjoon_problem_title(solved_problem)
-        description_text += f"[{problem_title}](https://www.acmicpc.net/problem/{solved_problem}) - {solved_problem}\n"
+    else:
+        message = await interaction.followup.send(f"저장된 푼 문제가 없어 solved.ac에서 확인하는 중입니다.", ephemeral=True, wait=True)
 
-    embed = discord.Embed(
-        title="푼 문제 목록(top 50):",
-        description=description_text
-    )
-    
-    await interaction.followup.send(embed=embed, ephemeral=True)
+    if refresh is not None:
+        edit_when_refreshed(message, [refresh], view, "해당 사용자는 아직 문제를 풀지 않았습니다.")
 
 
 
@@ -568,10 +723,11 @@ async def get_solved_problems(interaction: discord.Interaction, solvedac_id: str
     app_commands.Choice(name="추가", value="add"),
     app_commands.Choice(name="삭제", value="delete"),
 ])
+@app_commands.autocomplete(rival_id=handle_autocomplete)
 async def rival_command(interaction: discord.Interaction, action: app_commands.Choice[str], rival_id: str):
     await interaction.response.defer(ephemeral=True)
 
-    solvedac_id = db.get_solvedac_handle(interaction.user.id)
+    solvedac_id = await db.get_solvedac_handle(interaction.user.id)
     if not solvedac_id:
         await interaction.followup.send(f"db에 사용자님의 정보를 찾을 수가 없습니다. 등록을 안했다면 /등록 을 해주세요.", ephemeral=True)
         return
@@ -579,11 +735,11 @@ async def rival_command(interaction: discord.Interaction, action: app_commands.C
     # /라이벌 추가 {rival_id}
     if action.value == "add":
         try:
-            isUser = db.is_user(rival_id)
+            isUser = await db.is_user(rival_id)
             if not isUser:
                 await interaction.followup.send(f"{rival_id}님은 아직 Sol2에 가입하지 않았습니다. 라이벌 신청을 하려면 라이벌이 Sol2에 가입되어 있어야 합니다.", ephemeral=True)
                 return
-            db.make_rival(solvedac_id, rival_id)
+            await db.make_rival(solvedac_id, rival_id)
             await interaction.followup.send(f"라이벌 목록에 {rival_id}님이 추가되었습니다", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"라이벌 추가 중 오류가 발생했습니다. {e}", ephemeral=True)
@@ -592,7 +748,7 @@ async def rival_command(interaction: discord.Interaction, action: app_commands.C
     # /라이벌 삭제 {rival_id}
     if action.value == "delete":
         try:
-            db.erase_rival(solvedac_id, rival_id)
+            await db.erase_rival(solvedac_id, rival_id)
             await interaction.followup.send(f"라이벌을 성공적으로 삭제하였습니다. {rival_id}", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"해당 라이벌이 없습니다. {e}", ephemeral=True)
@@ -603,11 +759,11 @@ async def rival_command(interaction: discord.Interaction, action: app_commands.C
 async def get_rival(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
-    my_id = db.get_solvedac_handle(interaction.user.id)
+    my_id = await db.get_solvedac_handle(interaction.user.id)
     if not my_id:
         await interaction.followup.send(f"db에 사용자님의 정보를 찾을 수가 없습니다. 등록을 안했다면 /등록 을 해주세요.", ephemeral=True)
         return
-    rival_list = db.get_rival(my_id)
+    rival_list = await db.get_rival(my_id)
     
     if not rival_list:
         await interaction.followup.send("라이벌이 없습니다. /라이벌 추가 를 통해 라이벌을 만들어주세요.", ephemeral=True)
@@ -626,11 +782,11 @@ async def get_rival(interaction: discord.Interaction):
 async def get_reverse_rival(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
 
-    my_id = db.get_solvedac_handle(interaction.user.id)
+    my_id = await db.get_solvedac_handle(interaction.user.id)
     if not my_id:
         await interaction.followup.send(f"db에 사용자님의 정보를 찾을 수가 없습니다. 등록을 안했다면 /등록 을 해주세요.", ephemeral=True)
         return
-    reverse_list = db.get_reverse_rival(my_id)
+    reverse_list = await db.get_reverse_rival(my_id)
     if not reverse_list:
         await interaction.followup.send("당신을 라이벌로 지정한 사람이 없습니다.", ephemeral=True)
         return
@@ -643,59 +799,247 @@ async def get_reverse_rival(interaction: discord.Interaction):
 
     await interaction.followup.send(embed=embed, ephemeral= True)
 
-# /라이벌도전장 {rival_id}
+# /라이벌도전장 {rival_id} {page} {sort}
 @bot.tree.command(name="라이벌도전장", description="라이벌이 푼 문제 중 내가 못 푼 문제를 출력합니다.")
-async def rival_challenge(interaction: discord.Interaction, rival_id: str):
+@app_commands.describe(page="페이지 번호 (기본 1)", sort="정렬 기준 (기본 난이도순)")
+@app_commands.choices(sort=[
+    app_commands.Choice(name="난이도순", value="level"),
+    app_commands.Choice(name="번호순", value="id"),
+])
+@app_commands.autocomplete(rival_id=handle_autocomplete)
+async def rival_challenge(interaction: discord.Interaction, rival_id: str, page: app_commands.Range[int, 1] = 1, sort: Optional[app_commands.Choice[str]] = None):
     await interaction.response.defer(ephemeral=True)
 
-    isUser = db.is_user(rival_id)
+    isUser = await db.is_user(rival_id)
     if not isUser:
         await interaction.followup.send(f"{rival_id}는 Sol2 이용자가 아니므로, 불러올 수 없습니다.", ephemeral=True)
         return
     
-    solvedac_id = db.get_solvedac_handle(interaction.user.id)
+    solvedac_id = await db.get_solvedac_handle(interaction.user.id)
     if not solvedac_id:
         await interaction.followup.send(f"db에 사용자님의 정보를 찾을 수가 없습니다. 등록을 안했다면 /등록 을 해주세요.")
         return
     
-    my_solved_problem_list = db.get_user_top100(solvedac_id)
-    if not my_solved_problem_list:
-        return
+    # 오래된 정보면 지금 정보로 먼저 답하고, 두 사람의 동기화가 끝나면 답장을 고친다
+    refreshes = [task for task in [
+        await sync_scheduler.refresh_if_stale(rival_id),
+        await sync_scheduler.refresh_if_stale(solvedac_id)
+    ] if task is not None]
+
+    order_by = sort.value if sort else "level"
+    total_count = 0
+    synced_text = ""
+
+    async def count_pages() -> int:
+        nonlocal total_count, synced_text
+        total_count = await db.count_rival_challenge(solvedac_id, rival_id)
+        synced_text = await get_synced_text(rival_id)
+        return (total_count + RIVAL_CHALLENGE_PAGE_SIZE - 1) // RIVAL_CHALLENGE_PAGE_SIZE
+
+    # 보고 있는 페이지의 문제 번호와 제목만 가져온다
+    async def render_page(page: int, page_count: int) -> discord.Embed:
+        rival_challenge_list = await db.get_rival_challenge(
+            solvedac_id, rival_id,
+            limit=RIVAL_CHALLENGE_PAGE_SIZE,
+            offset=(page - 1) * RIVAL_CHALLENGE_PAGE_SIZE,
+            order_by=order_by
+        )
 
-    rival_solved_problem_list = db.get_user_top100(rival_id)
-    if not rival_solved_problem_list:
-        await interaction.followup.send(f"해당 사용자는 아직 문제를 풀지 않았습니다." , ephemeral=True)
-        return
-    
-    rival_challenge_list = [pid for pid in rival_solved_problem_list if pid not in my_solved_problem_list]
+        description_text = f"{rival_id}님이 풀었지만 아직 당신이 풀지 않은 문제들입니다.(총 {total_count}문제)\n"
+        description_text += synced_text
+        await titles.load(page, rival_challenge_list)
+        for solved_problem in rival_challenge_list:
+            problem_title = titles.title(solved_problem)
+            description_text += f"[{problem_title}](https://www.acmicpc.net/problem/{solved_problem}) - {solved_problem}\n"
 
-    if not rival_challenge_list:
-        await interaction.followup.send(f"{rival_id}님이 푼 문제 중 새로운 문제가 없습니다.", ephemeral=True)
+        embed = discord.Embed(
+            title=f"라이벌 도전장 ({page}/{page_count})",
+            description=description_text  # 필드 대신 설명에 넣음
+        )
+        add_offline_notice(embed)
+        return embed
+
+    empty_text = f"{rival_id}님이 푼 문제 중 새로운 문제가 없습니다."
+    view = PaginatedView(count_pages, render_page, interaction.user.id, page)
+    titles = ProblemTitleLoader(view)
+    if await view.reload():
+        message = await send_paginated(interaction, view)
+    elif not refreshes:
+        await interaction.followup.send(empty_text, ephemeral=True)
         return
+    else:
+        message = await interaction.followup.send(f"{empty_text} solved.ac에서 다시 확인하는 중입니다.", ephemeral=True, wait=True)
 
-    description_text = f"{rival_id}님이 풀었지만 아직 당신이 풀지 않은 문제들입니다.(최대 50문제)\n"
-    for solved_problem in rival_challenge_list[:50]:
-        problem_title = await get_baekjoon_problem_title(solved_problem)
-        description_text += f"[{problem_title}](https://www.acmicpc.net/problem/{solved_problem}) - {solved_problem}\n"
+    if refreshes:
+        edit_when_refreshed(message, refreshes, view, empty_text)
 
-    embed = discord.Embed(
-        title="라이벌 도전장",
-        description=description_text  # 필드 대신 설명에 넣음
+# ==================== 봇 관리자 명령어 ==================== #
+
+# /통계
+@bot.tree.command(name="통계", description="(봇 관리자 전용)solved.ac 요청 통계를 출력합니다.")
+@is_bot_owner()
+async def api_stats(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+
+    def format_ms(seconds: Optional[float]) -> str:
+        return f"{seconds * 1000:.0f}ms" if seconds is not None else "-"
+
+    embed = discord.Embed(title="solved.ac 요청 통계")
+    summary = metrics.get_summary()
+    for endpoint, stats in summary.items():
+        errors = ", ".join(f"{status}: {count}" for status, count in stats['errors'].items()) or "없음"
+        embed.add_field(
+            name=endpoint,
+            value=(
+                f"요청 {stats['requests']} · 재시도 {stats['retries']} · 오류 {errors}\n"
+                f"p50 {format_ms(stats['p50'])} · p95 {format_ms(stats['p95'])} · p99 {format_ms(stats['p99'])}\n"
+                f"받은 데이터 {stats['bytes'] / 1024:.1f}KB"
+            ),
+            inline=False
+        )
+    if not summary:
+        embed.description = "아직 solved.ac 요청이 없습니다."
+
+    cache_stats = api.get_cache_stats()
+    embed.add_field(
+        name="응답 캐시",
+        value=f"적중 {cache_stats['hits']} · 실패 {cache_stats['misses']} · 합침 {cache_stats['coalesced']} · 크기 {cache_stats['size']}",
+        inline=False
     )
-    
+
+    recent_runs = await db.get_recent_sync_runs(1)
+    if recent_runs:
+        run = recent_runs[0]
+        if run['finished_at'] is None:
+            status = "진행 중" if sync_scheduler.is_running() else "중단됨"
+        else:
+            status = f"{run['finished_at'] - run['started_at']}초"
+        embed.add_field(
+            name="최근 푼 문제 동기화",
+            value=(
+                f"<t:{run['started_at']}:f> · {status}\n"
+                f"사용자 {run['users_processed']}/{run['users_total']}명 · 요청 {run['api_calls']}회 · 새로 푼 문제 {run['new_solves']}개"
+            ),
+            inline=False
+        )
+
     await interaction.followup.send(embed=embed, ephemeral=True)
 
-# ==================== 기타 명령어들 ==================== #
+# /백업
+@bot.tree.command(name="백업", description="(봇 관리자 전용)db를 지금 백업합니다.")
+@is_bot_owner()
+async def backup_now(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
 
-async def get_baekjoon_problem_title(problem_id: int):
     try:
-        baekjoon_problem_info = await api.get_problem_from_num(problem_id)
-        titleKo = baekjoon_problem_info.get('titleKo') or baekjoon_problem_info.get('title') or f"문제 {problem_id}"
-        return titleKo
+        stats = await asyncio.to_thread(backup.create_backup)
     except Exception as e:
-        print(f"문제 확인하는 데 오류 {e}")
+        await interaction.followup.send(f"백업에 실패했습니다. {e}", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="db 백업 완료", description=stats['path'])
+    embed.add_field(name="소요 시간", value=f"{stats['seconds']:.2f}초", inline=True)
+    embed.add_field(name="페이지", value=f"{stats['pages']} ({stats['pages_per_second']:.0f}페이지/초)", inline=True)
+    embed.add_field(name="보관 중인 백업", value=f"{len(backup.list_backups())}개", inline=True)
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+# ==================== 기타 명령어들 ==================== #
+
+# solved.ac 장애 중이면 저장된 정보로 응답했다는 안내를 붙인다
+def add_offline_notice(embed: discord.Embed):
+    if not api.is_available():
+        embed.set_footer(text="solved.ac에 연결할 수 없어 저장된 정보를 표시합니다.")
+
+# 마지막 동기화 시각 안내 (디스코드가 보는 사람의 시간대로 "n분 전"처럼 표시한다)
+async def get_synced_text(solvedac_handle: str) -> str:
+    last_synced_at = await db.get_last_synced(solvedac_handle)
+    if last_synced_at is None:
+        return ""
+    return f"-# {solvedac_handle}님 마지막 동기화: <t:{last_synced_at}:R>\n"
+
+# 페이지 목록의 첫 페이지를 보내고 버튼을 붙인다
+async def send_paginated(interaction: discord.Interaction, view: PaginatedView) -> discord.WebhookMessage:
+    embed = await view.current_embed()
+    message = await interaction.followup.send(embed=embed, view=view, ephemeral=True, wait=True)
+    view.attach(message)
+    return message
+
+# 백그라운드 동기화가 끝나면 목록을 다시 읽어 답장을 고친다
+# 새로 푼 문제가 없어도 마지막 동기화 시각이 바뀌므로 다시 그린다
+# 목록이 비었으면(예: 라이벌 문제를 모두 풂) empty_text로, 동기화에 실패해 보여 줄 것이 없으면 실패 안내로 바꾼다
+REFRESH_FAILED_TEXT = "solved.ac에서 푼 문제를 확인하지 못했습니다. 잠시 후 다시 시도해 주세요."
+_edit_tasks: set = set()
+
+def edit_when_refreshed(message: discord.WebhookMessage, refreshes: list, view: PaginatedView, empty_text: str):
+    async def edit():
+        results = await asyncio.gather(*refreshes, return_exceptions=True)
+        failed = any(result is None or isinstance(result, BaseException) for result in results)
+        try:
+            if await view.reload():
+                await view.edit_message(message)
+            else:
+                await view.replace_message(message, REFRESH_FAILED_TEXT if failed else empty_text)
+        except discord.HTTPException as e:
+            print(f"edit_when_refreshed Error: {e}")
+
+    task = asyncio.create_task(edit())
+    _edit_tasks.add(task)
+    task.add_done_callback(_edit_tasks.discard)
+
+# 페이지 목록의 문제 제목을 점진적으로 채운다
+# db에 저장된 제목만으로 페이지를 바로 그리고, 저장되지 않은 문제는 백그라운드로 solved.ac에서 가져와
+# 도착할 때마다 view.refresh_page()로 그 페이지를 다시 그린다 (메시지 수정은 PaginatedView가 모아서 한다)
+class ProblemTitleLoader:
+    def __init__(self, view: PaginatedView):
+        self.view = view
+        self.problems: dict = {}   # {문제 번호: 문제 정보}
+        self._loading: set = set()
+        self._failed: set = set()
+        self._tasks: set = set()
+
+    # 페이지에 보여 줄 문제들 중 아직 모르는 문제를 가져오기 시작한다
+    async def load(self, page: int, problem_ids: list):
+        unknown_ids = [pid for pid in problem_ids if pid not in self.problems]
+        if not unknown_ids:
+            return
+        try:
+            self.problems.update(await api.get_cached_problems(unknown_ids))
+        except Exception as e:
+            print(f"문제 정보 확인하는 데 오류 {e}")
+
+        missing_ids = [pid for pid in unknown_ids if pid not in self.problems and pid not in self._loading and pid not in self._failed]
+        if missing_ids and not api.is_available():
+            self._failed.update(missing_ids)
+        elif missing_ids:
+            self._loading.update(missing_ids)
+            task = asyncio.create_task(self._fetch(page, missing_ids))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, page: int, problem_ids: list):
+        try:
+            async for problems in api.iter_fetched_problems(problem_ids):
+                self.problems.update(problems)
+                self._loading.difference_update(problems)
+                self.view.refresh_page(page)
+        except Exception as e:
+            print(f"문제 목록 확인하는 데 오류 {e}")
+        finally:
+            # 응답에 없었거나 가져오지 못한 문제는 번호로만 보여 준다
+            failed_ids = [pid for pid in problem_ids if pid in self._loading]
+            if failed_ids:
+                self._loading.difference_update(failed_ids)
+                self._failed.update(failed_ids)
+                self.view.refresh_page(page)
+
+    def title(self, problem_id: int) -> str:
+        problem_info = self.problems.get(problem_id)
+        if problem_info is not None:
+            return problem_info.get('titleKo') or problem_info.get('title') or "제목없음"
+        if problem_id in self._loading:
+            return "제목 불러오는 중…"
         return f"문제 {problem_id}"
-    
+
 async def get_user_top100_from_api(solvedac_handle: str) -> Optional[list]:
     try:
         user_top100_list_json = await api.get_user_top100(solvedac_handle)
@@ -706,32 +1050,34 @@ async def get_user_top100_from_api(solvedac_handle: str) -> Optional[list]:
         print(f"get_list_user_top100 Error: {e}")
         return None
 
-async def did_user_solved_today(solvedac_id: str) -> Optional[bool]:
-    isUser = db.is_user(solvedac_id)
-    if not isUser:
-        return
-    
-    updated_top100_list = await get_user_top100_from_api(solvedac_id)
-    if not updated_top100_list:
-        return
-    
-    newly_added_problems = db.update_user_top100(solvedac_id, updated_top100_list)
-    if newly_added_problems:
-        return True
-    else:
-        return False
+@tasks.loop(seconds=30)
+async def write_metrics_snapshot():
+    cache_stats = api.get_cache_stats()
+    extra_counters = {f"sol2_api_cache_{name}": value for name, value in cache_stats.items()}
+    try:
+        metrics.write_snapshot(METRICS_FILE, extra_counters)
+    except OSError as e:
+        print(f"write_metrics_snapshot Error: {e}")
 
-async def check_user_new_solved():
-    users = db.get_users_for_update()
-    if not users:
-        return
-    
-    for user in users:
-        await did_user_solved_today(user)
+# 주기가 돌아온 사용자의 푼 문제 동기화
+@tasks.loop(seconds=sync_scheduler.SYNC_CHECK_INTERVAL)
+async def sync_solved_problems():
+    try:
+        await sync_scheduler.run_sync()
+    except Exception as e:
+        print(f"sync_solved_problems Error: {e}")
+
+@sync_solved_problems.before_loop
+async def before_sync_loop():
+    await bot.wait_until_ready()
 
+# 매일 05:00 (KST), 새 문제 목록 추가
 @tasks.loop(hours=24)
 async def daily_update():
-    await check_user_new_solved()
+    try:
+        await problem_catalog.refresh_new_problems()
+    except Exception as e:
+        print(f"refresh_new_problems Error: {e}")
 
 @daily_update.before_loop
 async def before_daily_loop():
@@ -743,6 +1089,25 @@ async def before_daily_loop():
         target_kst += datetime.timedelta(days=1)
     await discord.utils.sleep_until(target_kst)
 
+# 매일 04:30 (KST), 일일 업데이트 전에 백업
+# 백업은 단계 사이에 쉬면서 오래 걸리므로 db 스레드가 아닌 별도 스레드에서 실행한다
+@tasks.loop(hours=24)
+async def daily_backup():
+    try:
+        await asyncio.to_thread(backup.create_backup)
+    except Exception as e:
+        print(f"daily_backup Error: {e}")
+
+@daily_backup.before_loop
+async def before_daily_backup():
+    await bot.wait_until_ready()
+    kst = datetime.timezone(datetime.timedelta(hours=9))
+    now_kst = datetime.datetime.now(kst)
+    target_kst = now_kst.replace(hour=4, minute=30, second=0, microsecond=0)
+    if now_kst >= target_kst:
+        target_kst += datetime.timedelta(days=1)
+    await discord.utils.sleep_until(target_kst)
+
 if DISCORD_BOT_TOKEN:
     bot.run(DISCORD_BOT_TOKEN)
 else:
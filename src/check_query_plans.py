@@ -0,0 +1,142 @@
+import os
+import sys
+import tempfile
+
+import db_manager as db
+
+# db_manager 함수들이 실제로 실행하는 쿼리를 모아 EXPLAIN QUERY PLAN으로 확인한다
+# 인덱스 없이 테이블 전체를 훑는 쿼리가 있으면 실패 (종료 코드 1)
+#
+#   python check_query_plans.py
+
+# 전체를 훑는 것이 정상인 함수 (시작 시 한 번 또는 전체 사용자 대상, 또는 rowid 역순으로 앞 몇 행만 읽는 경우)
+FULL_SCAN_ALLOWED = {"build_name_index", "get_users_for_update", "get_users_due_for_sync", "get_recent_sync_runs"}
+# 한 번의 배치 데이터만 담는 임시 테이블은 전체를 읽는 것이 정상
+BATCH_TABLES = {"sync_incoming", "sync_new"}
+
+def _seed():
+    db.register_user(1, "alice")
+    db.register_user(2, "bob")
+    db.create_group("group", 10, 100, 1)
+    group_id = db.get_group_id(10, 100)
+    db.add_group_member(2, "bob", group_id)
+    db.create_problem_set(group_id, "set")
+    set_id = db.get_set_id(group_id, "set")
+    db.add_problem(set_id, 1000)
+    db.insert_user_top100("alice", [1000, 1001])
+    db.make_rival("alice", "bob")
+    db.start_sync_run(2)
+    db.upsert_problems([{"problemId": 1000, "titleKo": "A+B", "title": "A+B", "level": 1, "tags": []}])
+    return group_id, set_id
+
+# (함수 이름, 인자) 목록, 쓰기 함수는 뒤쪽에 둔다
+def _calls(group_id: int, set_id: int) -> list:
+    return [
+        ("get_solvedac_handle", (1,)),
+        ("is_user", ("alice",)),
+        ("is_registered_user", (1,)),
+        ("get_users_for_update", ()),
+        ("get_group_id", (10, 100)),
+        ("get_group_name", (group_id,)),
+        ("get_group_manager", (group_id,)),
+        ("get_channel_id", (group_id,)),
+        ("get_member", (group_id,)),
+        ("is_member", ("bob", group_id)),
+        ("get_user_top100", ("alice",)),
+        ("get_rival_challenge", ("bob", "alice", 30, 0, "level")),
+        ("get_rival_challenge", ("bob", "alice", 30, 0, "id")),
+        ("count_rival_challenge", ("bob", "alice")),
+        ("get_solved_bitmaps", (["alice", "bob"],)),
+        ("get_group_solved_bitmap", (group_id,)),
+        ("get_solvers", (1000, ["alice", "bob"])),
+        ("count_group_solved", (group_id, [1000, 1001])),
+        ("get_problem_set", (group_id,)),
+        ("get_set_id", (group_id, "set")),
+        ("get_problem", (set_id,)),
+        ("get_set_progress", (set_id,)),
+        ("get_member_progress", (group_id, 2)),
+        ("get_rival", ("alice",)),
+        ("get_reverse_rival", ("bob",)),
+        ("get_problems_info", ([1000, 1001],)),
+        ("get_max_problem_id", ()),
+        ("search_problems", ("100",)),
+        ("search_problems", ("A+B",)),
+        ("get_unfinished_sync_run", ()),
+        ("get_synced_handles", (1,)),
+        ("get_recent_sync_runs", ()),
+        ("get_users_due_for_sync", (0,)),
+        ("get_sync_schedules", (["alice", "bob"],)),
+        ("get_last_synced", ("alice",)),
+        ("build_name_index", ()),
+        ("update_user_top100", ("alice", [1000, 1002])),
+        ("sync_user_problems", ({"alice": [1000, 1003], "bob": [1000]},)),
+        ("add_problem", (set_id, 1003)),
+        ("add_group_member", (1, "alice", group_id)),
+        ("checkpoint_sync_run", (1, ["alice", "bob"], 3, 2)),
+        ("finish_sync_run", (1,)),
+        ("save_sync_schedules", ([("alice", 100, 3600, 1.0, 0), ("bob", 100, 3600, 0.0, 0)],)),
+        ("make_rival", ("bob", "alice")),
+        ("delete_problem", (set_id, 1000)),
+        ("erase_rival", ("alice", "bob")),
+        ("delete_member", (2, group_id)),
+        ("delete_problem_set", (group_id, "set")),
+        ("delete_group", ("group", 1))
+    ]
+
+def _is_checked(sql: str) -> bool:
+    head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return head in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")
+
+# 인덱스를 쓰지 않고 테이블 전체를 훑는 단계 찾기
+def _full_scans(con, sql: str) -> list:
+    plan = con.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    scans = []
+    for row in plan:
+        detail = row[3]
+        if not detail.startswith("SCAN "):
+            continue
+        if "USING INDEX" in detail or "USING COVERING INDEX" in detail or "VIRTUAL TABLE" in detail:
+            continue
+        if detail.split()[1] in BATCH_TABLES:
+            continue
+        scans.append(detail)
+    return scans
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db.DATABASE_FILE = os.path.join(tmp_dir, "plan.db")
+        db.init_db()
+        group_id, set_id = _seed()
+
+        con = db.get_db_connection()
+        failures = []
+        checked = 0
+        for name, args in _calls(group_id, set_id):
+            statements = []
+            con.set_trace_callback(statements.append)
+            try:
+                getattr(db, name)(*args)
+            finally:
+                con.set_trace_callback(None)
+
+            for sql in dict.fromkeys(statements):
+                if not _is_checked(sql):
+                    continue
+                checked += 1
+                scans = _full_scans(con, sql)
+                status = "ok"
+                if scans and name not in FULL_SCAN_ALLOWED:
+                    status = "FULL SCAN"
+                    failures.append((name, sql, scans))
+                elif scans:
+                    status = "full scan (allowed)"
+                print(f"[{status}] {name}: {' '.join(sql.split())[:100]}")
+        db.close_db_connections()
+
+    print(f"\n{checked}개 쿼리 확인, 실패 {len(failures)}개")
+    for name, sql, scans in failures:
+        print(f"  {name}: {'; '.join(scans)}\n    {' '.join(sql.split())}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,72 @@
 import sqlite3
+import json
+import threading
+import time
 from typing import Optional
 
+import identity_cache
+import name_index
+import solved_bitmap
+
 DATABASE_FILE = "sol2.db"
 
+# 연결마다 재사용할 준비된 쿼리 수 (이 모듈의 쿼리 종류보다 넉넉하게)
+STATEMENT_CACHE_SIZE = 256
+
+# 연결을 처음 만들 때 한 번만 설정하는 PRAGMA
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",      # WAL에서는 NORMAL이어도 db가 깨지지 않는다
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -16000",       # 16MB
+    "PRAGMA mmap_size = 268435456",     # 256MB
+    "PRAGMA temp_store = MEMORY"
+)
+
+_local = threading.local()
+_connections: list = []
+_connections_lock = threading.Lock()
+# close_db_connections()가 불릴 때마다 증가, 다른 스레드에 남은 닫힌 연결을 알아채기 위해 사용
+_generation = 0
+
+# SQLite 한 쿼리에 넣을 수 있는 바인딩 변수 수를 넘지 않도록 나눠서 조회
+MAX_QUERY_PARAMS = 900
+
+# 스레드마다 연결 하나를 만들어 계속 재사용한다
+# with get_db_connection() as con: 블록은 트랜잭션만 커밋/롤백하고 연결은 닫지 않는다
 def get_db_connection():
-    con = sqlite3.connect(DATABASE_FILE)
+    con = getattr(_local, "connection", None)
+    if con is not None and _local.database_file == DATABASE_FILE and _local.generation == _generation:
+        return con
+
+    # check_same_thread=False는 종료 시 다른 스레드에서 닫기 위한 것 (사용은 만든 스레드에서만)
+    con = sqlite3.connect(DATABASE_FILE, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
     con.row_factory = sqlite3.Row
-    con.execute("PRAGMA foreign_keys = ON")
-    con.execute("PRAGMA journal_mode = WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        con.execute(pragma)
+
+    _local.connection = con
+    _local.database_file = DATABASE_FILE
+    _local.generation = _generation
+    with _connections_lock:
+        _connections.append(con)
     return con
 
+# 봇 종료 시 모든 스레드의 연결 닫기
+def close_db_connections():
+    global _generation
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+        _generation += 1
+    for con in connections:
+        try:
+            con.close()
+        except sqlite3.Error as e:
+            print(f"close_db_connections() Error: {e}")
+    identity_cache.clear()
+
 def init_db():
     with get_db_connection() as con:
         cursor = con.cursor()
@@ -103,23 +160,215 @@ def init_db():
         )
 		''')
 
+        # 문제 정보 테이블 (solved.ac 문제 메타데이터 캐시)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS problems (
+            problem_id INTEGER PRIMARY KEY,
+            title_ko TEXT,
+            title TEXT,
+            level INTEGER,
+            tags TEXT,
+            fetched_at INTEGER NOT NULL
+        )
+        ''')
+
+        # 문제 제목 전문 검색 색인 (자동 완성용, problems 테이블과 트리거로 동기화)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'problems_fts'")
+        has_problem_index = cursor.fetchone() is not None
+        cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS problems_fts USING fts5(
+            title_ko,
+            title,
+            content = 'problems',
+            content_rowid = 'problem_id',
+            prefix = '1 2 3'
+        )
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS problems_fts_insert AFTER INSERT ON problems BEGIN
+            INSERT INTO problems_fts (rowid, title_ko, title) VALUES (new.problem_id, new.title_ko, new.title);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS problems_fts_delete AFTER DELETE ON problems BEGIN
+            INSERT INTO problems_fts (problems_fts, rowid, title_ko, title) VALUES ('delete', old.problem_id, old.title_ko, old.title);
+        END
+        ''')
+        cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS problems_fts_update AFTER UPDATE OF title_ko, title ON problems
+        WHEN old.title_ko IS NOT new.title_ko OR old.title IS NOT new.title BEGIN
+            INSERT INTO problems_fts (problems_fts, rowid, title_ko, title) VALUES ('delete', old.problem_id, old.title_ko, old.title);
+            INSERT INTO problems_fts (rowid, title_ko, title) VALUES (new.problem_id, new.title_ko, new.title);
+        END
+        ''')
+        # 색인이 없던 db라면 이미 저장된 문제들로 색인을 만든다
+        if not has_problem_index:
+            cursor.execute("INSERT INTO problems_fts (problems_fts) VALUES ('rebuild')")
         
         con.commit()
 
+        migrate(con)
+
+# ==================== 스키마 마이그레이션 ====================
+
+# 이미 저장된 푼 문제들로 사용자별 비트맵 만들기
+def _backfill_solved_bitmaps(con):
+    solved = {}
+    for row in con.execute("SELECT solvedac_handle, problem_id FROM user_top100_problems"):
+        solved.setdefault(row['solvedac_handle'], []).append(row['problem_id'])
+    con.executemany(
+        "INSERT OR REPLACE INTO user_solved_bitmaps (solvedac_handle, bitmap) VALUES (?, ?)",
+        [(handle, solved_bitmap.from_ids(problem_ids)) for handle, problem_ids in solved.items()]
+    )
+
+# 위의 CREATE TABLE들이 버전 0이고, 아래 목록의 n번째 항목이 버전 n
+# 각 항목은 SQL 문자열 또는 연결을 받는 함수의 목록이며, 한 버전은 트랜잭션 하나로 적용된다
+# 이미 배포된 항목은 고치지 말고 항상 끝에 새 항목을 추가한다
+MIGRATIONS = [
+    # 1: 자주 쓰는 조회에 인덱스 추가
+    [
+        # get_problem, delete_problem
+        "CREATE INDEX IF NOT EXISTS idx_problem_set_problems_set ON problem_set_problems (set_id, problem_id)",
+        # get_member
+        "CREATE INDEX IF NOT EXISTS idx_members_group ON members (group_id)",
+        # get_reverse_rival
+        "CREATE INDEX IF NOT EXISTS idx_rival_rival_id ON rival (rival_id)",
+        # get_group_id (그룹 채널 명령어마다 호출)
+        "CREATE INDEX IF NOT EXISTS idx_groups_server_channel ON groups (server_id, channel_id)",
+        # delete_group
+        "CREATE INDEX IF NOT EXISTS idx_groups_name_manager ON groups (group_name, manager_id)",
+        # problem_set_problems 삭제 시 외래 키 연쇄 삭제
+        "CREATE INDEX IF NOT EXISTS idx_member_solved_problems_problem ON member_solved_problems (problem_id)"
+    ],
+    # 2: 사용자별 푼 문제 비트맵 (user_top100_problems와 같은 내용, 집합 연산용)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS user_solved_bitmaps (
+            solvedac_handle TEXT PRIMARY KEY,
+            bitmap BLOB NOT NULL,
+            FOREIGN KEY (solvedac_handle) REFERENCES users (solvedac_handle) ON DELETE CASCADE
+        )
+        """,
+        _backfill_solved_bitmaps
+    ],
+    # 3: 그룹원별 문제집 진행도 (member_solved_problems) 채우기, 이후로는 쓰기 함수들이 바로 갱신한다
+    [
+        """
+        INSERT OR IGNORE INTO member_solved_problems (member_id, problem_id)
+        SELECT m.id, psp.id
+        FROM members m
+        JOIN users u ON u.discord_id = m.discord_id
+        JOIN problem_sets ps ON ps.group_id = m.group_id
+        JOIN problem_set_problems psp ON psp.set_id = ps.set_id
+        JOIN user_top100_problems t ON t.solvedac_handle = u.solvedac_handle AND t.problem_id = psp.problem_id
+        """
+    ],
+    # 4: 일일 동기화 실행 기록과 진행 체크포인트 (봇이 재시작되면 끝나지 않은 실행을 이어서 한다)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS sync_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at INTEGER NOT NULL,
+            finished_at INTEGER,
+            users_total INTEGER NOT NULL,
+            users_processed INTEGER NOT NULL DEFAULT 0,
+            api_calls INTEGER NOT NULL DEFAULT 0,
+            new_solves INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS sync_run_users (
+            run_id INTEGER NOT NULL,
+            solvedac_handle TEXT NOT NULL,
+            PRIMARY KEY (run_id, solvedac_handle),
+            FOREIGN KEY (run_id) REFERENCES sync_runs (run_id) ON DELETE CASCADE
+        )
+        """,
+        # get_unfinished_sync_run
+        "CREATE INDEX IF NOT EXISTS idx_sync_runs_unfinished ON sync_runs (finished_at, run_id)"
+    ],
+    # 5: 사용자별 동기화 주기 (푼 문제가 자주 늘어나는 사용자일수록 자주 동기화)
+    [
+        """
+        CREATE TABLE IF NOT EXISTS user_sync_schedule (
+            solvedac_handle TEXT PRIMARY KEY,
+            next_sync_at INTEGER NOT NULL,
+            sync_interval INTEGER NOT NULL,
+            solve_rate REAL NOT NULL DEFAULT 0,
+            last_synced_at INTEGER,
+            FOREIGN KEY (solvedac_handle) REFERENCES users (solvedac_handle) ON DELETE CASCADE
+        )
+        """
+    ]
+]
+
+def get_schema_version(con) -> int:
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+# PRAGMA user_version보다 높은 버전의 마이그레이션을 순서대로 적용
+def migrate(con):
+    current_version = get_schema_version(con)
+    for version, steps in enumerate(MIGRATIONS, start=1):
+        if version <= current_version:
+            continue
+        try:
+            con.execute("BEGIN IMMEDIATE")
+            for step in steps:
+                if callable(step):
+                    step(con)
+                else:
+                    con.execute(step)
+            # user_version도 같은 트랜잭션 안에서 바뀌므로 실패하면 함께 롤백된다
+            con.execute(f"PRAGMA user_version = {version}")
+            con.commit()
+            print(f"db 스키마를 버전 {version}(으)로 올렸습니다.")
+        except Exception:
+            con.rollback()
+            raise
+
+# 자동 완성용 메모리 색인과 사용자/그룹 식별 캐시를 db 내용으로 새로 만들기 (봇 시작 시 한 번)
+def build_name_index():
+    with get_db_connection() as con:
+        cursor = con.cursor()
+
+        cursor.execute("SELECT discord_id, solvedac_handle FROM users")
+        users = [(row['discord_id'], row['solvedac_handle']) for row in cursor.fetchall()]
+        name_index.handles.replace_all({None: [handle for _, handle in users]})
+
+        cursor.execute("SELECT group_id, group_name, server_id, channel_id, manager_id FROM groups")
+        groups = [dict(row) for row in cursor.fetchall()]
+        group_names = {}
+        for group in groups:
+            group_names.setdefault(group['server_id'], []).append(group['group_name'])
+        name_index.group_names.replace_all(group_names)
+        identity_cache.replace_all(users, groups)
+
+        cursor.execute("SELECT group_id, set_name FROM problem_sets WHERE set_name IS NOT NULL")
+        set_names = {}
+        for row in cursor.fetchall():
+            set_names.setdefault(row['group_id'], []).append(row['set_name'])
+        name_index.set_names.replace_all(set_names)
+
 # ==================== 사용자 테이블 관련 함수 ====================
 
 # 사용자 등록
 def register_user(discord_id: int, solvedac_handle: str) -> bool:
     with get_db_connection() as con:
         try:
-            con.execute("INSERT OR IGNORE INTO users (discord_id, solvedac_handle) VALUES (?, ?)", (discord_id, solvedac_handle))
+            cur = con.execute("INSERT OR IGNORE INTO users (discord_id, solvedac_handle) VALUES (?, ?)", (discord_id, solvedac_handle))
             con.commit()
+            if cur.rowcount > 0:
+                name_index.handles.add(None, solvedac_handle)
+                identity_cache.add_user(discord_id, solvedac_handle)
             return True
         except Exception as e:
             print(f"register_user() Error: {e}")
             return False
         
+# 아래 조회 함수들은 식별 캐시가 채워져 있으면 SQL 없이 캐시에서 답한다
 def get_solvedac_handle(discord_id: int) -> Optional[str]:
+    if identity_cache.is_loaded():
+        return identity_cache.get_handle(discord_id)
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT solvedac_handle FROM users WHERE discord_id = ?", (discord_id,))
@@ -127,6 +376,8 @@ def get_solvedac_handle(discord_id: int) -> Optional[str]:
         return result['solvedac_handle'] if result else None
     
 def is_user(solvedac_handle: str) -> bool:
+    if identity_cache.is_loaded():
+        return identity_cache.get_discord_id(solvedac_handle) is not None
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT discord_id FROM users WHERE solvedac_handle = ?", (solvedac_handle,))
@@ -137,6 +388,8 @@ def is_user(solvedac_handle: str) -> bool:
             return False
         
 def is_registered_user(discord_id: int) -> bool:
+    if identity_cache.is_loaded():
+        return identity_cache.get_handle(discord_id) is not None
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT * FROM users WHERE discord_id = ?", (discord_id,))
@@ -158,8 +411,16 @@ def get_users_for_update() -> list:
 def create_group(group_name: str, server_id: int|None, channel_id: int|None, manager_id: int) -> bool:
     with get_db_connection() as con:
         try:
-            con.execute("INSERT INTO groups (group_name, server_id, channel_id, manager_id) VALUES (?, ?, ?, ?)", (group_name, server_id, channel_id, manager_id))
+            cur = con.execute("INSERT INTO groups (group_name, server_id, channel_id, manager_id) VALUES (?, ?, ?, ?)", (group_name, server_id, channel_id, manager_id))
             con.commit()
+            name_index.group_names.add(server_id, group_name)
+            identity_cache.add_group({
+                "group_id": cur.lastrowid,
+                "group_name": group_name,
+                "server_id": server_id,
+                "channel_id": channel_id,
+                "manager_id": manager_id
+            })
             return True
         except Exception as e:
             print(f"create_group() Error: {e}")
@@ -168,14 +429,21 @@ def create_group(group_name: str, server_id: int|None, channel_id: int|None, man
 def delete_group(group_name: str, manager_id: int) -> bool:
     with get_db_connection() as con:
         try:
+            deleted_groups = con.execute("SELECT group_id, server_id FROM groups WHERE group_name = ? AND manager_id = ?", (group_name, manager_id)).fetchall()
             cur = con.execute("DELETE FROM groups WHERE group_name = ? AND manager_id = ?", (group_name, manager_id))
             con.commit()
+            for row in deleted_groups:
+                name_index.group_names.remove(row['server_id'], group_name)
+                name_index.set_names.remove_scope(row['group_id'])
+                identity_cache.remove_group(row['group_id'])
             return cur.rowcount > 0
         except Exception as e:
             print(f"delete_group() Error: {e}")
             return False
 
 def get_group_id(server_id: int|None, channel_id: int|None) -> Optional[int]:
+    if identity_cache.is_loaded():
+        return identity_cache.get_group_id(server_id, channel_id)
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT group_id FROM groups WHERE server_id = ? AND channel_id = ?", (server_id, channel_id))
@@ -183,6 +451,9 @@ def get_group_id(server_id: int|None, channel_id: int|None) -> Optional[int]:
         return result['group_id'] if result else None
     
 def get_group_name(group_id:int) -> Optional[str]:
+    if identity_cache.is_loaded():
+        group = identity_cache.get_group(group_id)
+        return group['group_name'] if group else None
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT group_name FROM groups WHERE group_id = ?", (group_id,))
@@ -190,6 +461,9 @@ def get_group_name(group_id:int) -> Optional[str]:
         return result['group_name'] if result else None
 
 def get_group_manager(group_id: int) -> Optional[int]:
+    if identity_cache.is_loaded():
+        group = identity_cache.get_group(group_id)
+        return group['manager_id'] if group else None
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT manager_id FROM groups WHERE group_id = ?", (group_id,))
@@ -199,6 +473,9 @@ def get_group_manager(group_id: int) -> Optional[int]:
         return None
 
 def get_channel_id(group_id: int) -> Optional[int]:
+    if identity_cache.is_loaded():
+        group = identity_cache.get_group(group_id)
+        return group['channel_id'] if group else None
     with get_db_connection() as con:
         cursor = con.cursor()
         cursor.execute("SELECT channel_id FROM groups WHERE group_id = ?", (group_id,))
@@ -214,6 +491,17 @@ def add_group_member(discord_id: int, solvedac_handle: str, group_id: int|None)
         register_user(discord_id, solvedac_handle)
         with get_db_connection() as con:
             con.execute("INSERT INTO members (discord_id, group_id) VALUES (?, ?)", (discord_id, group_id))
+            # 이미 푼 문제집 문제를 진행도에 채운다
+            con.execute("""
+                INSERT OR IGNORE INTO member_solved_problems (member_id, problem_id)
+                SELECT m.id, psp.id
+                FROM members m
+                JOIN problem_sets ps ON ps.group_id = m.group_id
+                JOIN problem_set_problems psp ON psp.set_id = ps.set_id
+                JOIN user_top100_problems t ON t.solvedac_handle = ? AND t.problem_id = psp.problem_id
+                WHERE m.discord_id = ? AND m.group_id = ?
+            """, (solvedac_handle, discord_id, group_id))
+            _mark_sync_due(con, [solvedac_handle])
             con.commit()
             return True
     except sqlite3.IntegrityError:
@@ -258,6 +546,8 @@ def insert_user_top100(solvedac_handle: str, problem_ids: list):
     with get_db_connection() as con:
         insert_data = [(solvedac_handle, pid) for pid in problem_set_ids]
         con.executemany("INSERT INTO user_top100_problems (solvedac_handle, problem_id) VALUES (?, ?)", insert_data)
+        _merge_solved_bitmaps(con, {solvedac_handle: problem_set_ids})
+        _record_member_solved(con, {solvedac_handle: problem_set_ids})
         con.commit()
 
 def get_user_top100(solvedac_handle: str) -> list:
@@ -280,10 +570,128 @@ def update_user_top100(solvedac_handle: str, new_problem_ids: list) -> list:
         if newly_added_problems:
             insert_data = [(solvedac_handle, pid) for pid in newly_added_problems]
             cursor.executemany("INSERT INTO user_top100_problems (solvedac_handle, problem_id) VALUES (?, ?)", insert_data)
+            _merge_solved_bitmaps(con, {solvedac_handle: newly_added_problems})
+            _record_member_solved(con, {solvedac_handle: newly_added_problems})
         
         con.commit()
         return newly_added_problems
 
+# 여러 사용자의 푼 문제를 한 트랜잭션으로 반영하고 사용자별로 새로 푼 문제를 반환
+# results: {핸들: [문제 번호...]} -> {핸들: [새로 푼 문제 번호...]}
+def sync_user_problems(results: dict) -> dict:
+    incoming = [(handle, pid) for handle, problem_ids in results.items() for pid in set(problem_ids)]
+    if not incoming:
+        return {}
+
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS sync_incoming (solvedac_handle TEXT NOT NULL, problem_id INTEGER NOT NULL)")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS sync_new (solvedac_handle TEXT NOT NULL, problem_id INTEGER NOT NULL)")
+        cursor.execute("DELETE FROM sync_incoming")
+        cursor.execute("DELETE FROM sync_new")
+        cursor.executemany("INSERT INTO sync_incoming (solvedac_handle, problem_id) VALUES (?, ?)", incoming)
+
+        # 이번 배치 사용자들의 기존 문제만 빼서 새로 푼 문제를 구한다 (등록되지 않은 핸들은 제외)
+        cursor.execute("""
+            INSERT INTO sync_new (solvedac_handle, problem_id)
+            SELECT sync_incoming.solvedac_handle, sync_incoming.problem_id
+            FROM sync_incoming
+            JOIN users ON users.solvedac_handle = sync_incoming.solvedac_handle
+            EXCEPT
+            SELECT solvedac_handle, problem_id
+            FROM user_top100_problems
+            WHERE solvedac_handle IN (SELECT solvedac_handle FROM sync_incoming)
+        """)
+        cursor.execute("INSERT INTO user_top100_problems (solvedac_handle, problem_id) SELECT solvedac_handle, problem_id FROM sync_new")
+
+        cursor.execute("SELECT solvedac_handle, problem_id FROM sync_new")
+        newly_added = {}
+        for row in cursor.fetchall():
+            newly_added.setdefault(row['solvedac_handle'], []).append(row['problem_id'])
+        _merge_solved_bitmaps(con, newly_added)
+        _record_member_solved(con, newly_added)
+        con.commit()
+        return newly_added
+
+# 푼 문제 비트맵에 새로 푼 문제 더하기 ({핸들: [문제 번호...]}), 호출한 쪽의 트랜잭션 안에서 실행된다
+def _merge_solved_bitmaps(con, solved: dict):
+    if not solved:
+        return
+    current = _load_solved_bitmaps(con, list(solved))
+    con.executemany(
+        "INSERT OR REPLACE INTO user_solved_bitmaps (solvedac_handle, bitmap) VALUES (?, ?)",
+        [(handle, solved_bitmap.union(current.get(handle, solved_bitmap.EMPTY), solved_bitmap.from_ids(problem_ids)))
+         for handle, problem_ids in solved.items()]
+    )
+
+def _load_solved_bitmaps(con, solvedac_handles: list) -> dict:
+    bitmaps = {}
+    for i in range(0, len(solvedac_handles), MAX_QUERY_PARAMS):
+        chunk = solvedac_handles[i:i + MAX_QUERY_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        rows = con.execute(f"SELECT solvedac_handle, bitmap FROM user_solved_bitmaps WHERE solvedac_handle IN ({placeholders})", chunk)
+        for row in rows:
+            bitmaps[row['solvedac_handle']] = bytes(row['bitmap'])
+    return bitmaps
+
+# 사용자별 푼 문제 비트맵 ({핸들: bytes}, 푼 문제가 없으면 빈 비트맵)
+def get_solved_bitmaps(solvedac_handles: list) -> dict:
+    with get_db_connection() as con:
+        bitmaps = _load_solved_bitmaps(con, list(solvedac_handles))
+        return {handle: bitmaps.get(handle, solved_bitmap.EMPTY) for handle in solvedac_handles}
+
+# 그룹 멤버 중 한 명이라도 푼 문제 비트맵
+def get_group_solved_bitmap(group_id: int) -> bytes:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("""
+            SELECT b.bitmap
+            FROM members m
+            JOIN users u ON u.discord_id = m.discord_id
+            JOIN user_solved_bitmaps b ON b.solvedac_handle = u.solvedac_handle
+            WHERE m.group_id = ?
+        """, (group_id,))
+        return solved_bitmap.union(*(bytes(row['bitmap']) for row in cursor.fetchall()))
+
+# 주어진 사용자 중 문제를 푼 사용자
+def get_solvers(problem_id: int, solvedac_handles: list) -> list:
+    bitmaps = get_solved_bitmaps(solvedac_handles)
+    return [handle for handle in solvedac_handles if solved_bitmap.contains(bitmaps[handle], problem_id)]
+
+# 주어진 문제 중 그룹원이 한 명이라도 푼 문제 수
+# 문제 번호로 비트맵을 만들면 번호가 클 때 메모리를 크게 쓰므로 문제마다 비트를 확인한다
+def count_group_solved(group_id: int, problem_ids: list) -> int:
+    group_bitmap = get_group_solved_bitmap(group_id)
+    return sum(1 for pid in set(problem_ids) if solved_bitmap.contains(group_bitmap, pid))
+
+# 라이벌이 풀었지만 내가 풀지 않은 문제 (order_by: "level"이면 어려운 문제부터, "id"면 번호순)
+# 번호순은 비트맵 차집합으로, 난이도순은 문제 정보와 함께 정렬해야 하므로 SQL로 구한다
+def get_rival_challenge(my_handle: str, rival_handle: str, limit: int = 50, offset: int = 0, order_by: str = "level") -> list:
+    if order_by != "level":
+        bitmaps = get_solved_bitmaps([my_handle, rival_handle])
+        challenge = solved_bitmap.difference(bitmaps[rival_handle], bitmaps[my_handle])
+        return solved_bitmap.to_ids(challenge)[offset:offset + limit]
+
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("""
+            SELECT r.problem_id
+            FROM user_top100_problems r
+            LEFT JOIN problems p ON p.problem_id = r.problem_id
+            WHERE r.solvedac_handle = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM user_top100_problems m
+                  WHERE m.solvedac_handle = ? AND m.problem_id = r.problem_id
+              )
+            ORDER BY COALESCE(p.level, 0) DESC, r.problem_id
+            LIMIT ? OFFSET ?
+        """, (rival_handle, my_handle, limit, offset))
+        return [row['problem_id'] for row in cursor.fetchall()]
+
+def count_rival_challenge(my_handle: str, rival_handle: str) -> int:
+    bitmaps = get_solved_bitmaps([my_handle, rival_handle])
+    return solved_bitmap.count(solved_bitmap.difference(bitmaps[rival_handle], bitmaps[my_handle]))
+
 # ==================== 문제집 테이블 관련 함수 ====================
 
 def create_problem_set(group_id: int, set_name: str) -> bool:
@@ -291,6 +699,7 @@ def create_problem_set(group_id: int, set_name: str) -> bool:
         try: 
             con.execute("INSERT INTO problem_sets (group_id, set_name) VALUES (?, ?)", (group_id, set_name))
             con.commit()
+            name_index.set_names.add(group_id, set_name)
             return True
         except Exception as e:
             print(f"Error create_problem_set: {e}")
@@ -300,6 +709,7 @@ def delete_problem_set(group_id: int, set_name: str) -> bool:
     with get_db_connection() as con:
         cur = con.execute("DELETE FROM problem_sets WHERE group_id = ? AND set_name = ?", (group_id, set_name))
         con.commit()
+        name_index.set_names.remove(group_id, set_name)
         return cur.rowcount > 0
 
 def get_problem_set(group_id: int) -> Optional[list]:
@@ -320,7 +730,17 @@ def get_set_id(group_id: int, set_name: str) -> Optional[int]:
 
 def add_problem(set_id: int, problem_id: int):
     with get_db_connection() as con:
-        con.execute("INSERT INTO problem_set_problems (set_id, problem_id) VALUES (?, ?)", (set_id, problem_id))
+        cur = con.execute("INSERT INTO problem_set_problems (set_id, problem_id) VALUES (?, ?)", (set_id, problem_id))
+        # 이미 이 문제를 푼 그룹원을 진행도에 채운다
+        con.execute("""
+            INSERT OR IGNORE INTO member_solved_problems (member_id, problem_id)
+            SELECT m.id, ?
+            FROM problem_sets ps
+            JOIN members m ON m.group_id = ps.group_id
+            JOIN users u ON u.discord_id = m.discord_id
+            JOIN user_top100_problems t ON t.solvedac_handle = u.solvedac_handle AND t.problem_id = ?
+            WHERE ps.set_id = ?
+        """, (cur.lastrowid, problem_id, set_id))
         con.commit()
 
 def delete_problem(set_id: int, problem_id: int):
@@ -337,11 +757,54 @@ def get_problem(set_id: int) -> Optional[list]:
     
 # ==================== 멤버가 푼 문제집 문제 테이블 ====================
 
+# 새로 푼 문제를 그룹원 진행도에 반영 ({핸들: [문제 번호...]}), 호출한 쪽의 트랜잭션 안에서 실행된다
+# 행이 지워지는 경우(탈퇴, 문제 삭제, 문제집 삭제)는 외래 키 연쇄 삭제로 처리된다
+def _record_member_solved(con, solved: dict):
+    con.executemany("""
+        INSERT OR IGNORE INTO member_solved_problems (member_id, problem_id)
+        SELECT m.id, psp.id
+        FROM users u
+        JOIN members m ON m.discord_id = u.discord_id
+        JOIN problem_sets ps ON ps.group_id = m.group_id
+        JOIN problem_set_problems psp ON psp.set_id = ps.set_id AND psp.problem_id = ?
+        WHERE u.solvedac_handle = ?
+    """, [(pid, handle) for handle, problem_ids in solved.items() for pid in problem_ids])
+
+# 문제집 문제별로 푼 그룹원 수 ({문제 번호: 푼 그룹원 수})
+def get_set_progress(set_id: int) -> dict:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("""
+            SELECT psp.problem_id, COUNT(msp.id) AS solved
+            FROM problem_set_problems psp
+            LEFT JOIN member_solved_problems msp ON msp.problem_id = psp.id
+            WHERE psp.set_id = ?
+            GROUP BY psp.id
+        """, (set_id,))
+        return {row['problem_id']: row['solved'] for row in cursor.fetchall()}
+
+# 그룹원 한 명의 문제집별 진행도 ([(문제집 이름, 푼 문제 수, 전체 문제 수)])
+def get_member_progress(group_id: int, discord_id: int) -> list:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("""
+            SELECT ps.set_name, COUNT(msp.id) AS solved, COUNT(psp.id) AS total
+            FROM problem_sets ps
+            LEFT JOIN problem_set_problems psp ON psp.set_id = ps.set_id
+            LEFT JOIN members m ON m.group_id = ps.group_id AND m.discord_id = ?
+            LEFT JOIN member_solved_problems msp ON msp.member_id = m.id AND msp.problem_id = psp.id
+            WHERE ps.group_id = ?
+            GROUP BY ps.set_id
+            ORDER BY ps.set_name
+        """, (discord_id, group_id))
+        return [(row['set_name'], row['solved'], row['total']) for row in cursor.fetchall()]
+
 # ==================== 라이벌 테이블 관련 함수 ====================
 
 def make_rival(my_id: str, rival_id: str):
     with get_db_connection() as con:
         con.execute("INSERT INTO rival (my_id, rival_id) VALUES (?, ?)", (my_id, rival_id))
+        _mark_sync_due(con, [my_id, rival_id])
         con.commit()
         
 def erase_rival(my_id:str, rival_id:str):
@@ -361,4 +824,216 @@ def get_reverse_rival(my_id:str) -> Optional[list]:
         cursor = con.cursor()
         cursor.execute("SELECT my_id FROM rival WHERE rival_id = ?", (my_id,))
         result = cursor.fetchall()
-        return [row['my_id'] for row in result] if result else None
\ No newline at end of file
+        return [row['my_id'] for row in result] if result else None
+
+# ==================== 일일 동기화 기록 관련 함수 ====================
+
+# 새 동기화 실행 기록을 만들고 번호를 반환
+def start_sync_run(users_total: int) -> int:
+    with get_db_connection() as con:
+        cur = con.execute("INSERT INTO sync_runs (started_at, users_total) VALUES (?, ?)", (int(time.time()), users_total))
+        con.commit()
+        return cur.lastrowid
+
+# 끝나지 않은 가장 최근 실행 (재시작 후 이어서 하기 위함)
+def get_unfinished_sync_run() -> Optional[dict]:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("SELECT * FROM sync_runs WHERE finished_at IS NULL ORDER BY run_id DESC LIMIT 1")
+        result = cursor.fetchone()
+        return dict(result) if result else None
+
+# 실행 중에 이미 처리한 사용자
+def get_synced_handles(run_id: int) -> list:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("SELECT solvedac_handle FROM sync_run_users WHERE run_id = ?", (run_id,))
+        return [row['solvedac_handle'] for row in cursor.fetchall()]
+
+# 처리한 사용자와 통계를 체크포인트로 저장
+def checkpoint_sync_run(run_id: int, solvedac_handles: list, api_calls: int, new_solves: int):
+    with get_db_connection() as con:
+        cur = con.executemany(
+            "INSERT OR IGNORE INTO sync_run_users (run_id, solvedac_handle) VALUES (?, ?)",
+            [(run_id, handle) for handle in solvedac_handles]
+        )
+        con.execute("""
+            UPDATE sync_runs
+            SET users_processed = users_processed + ?, api_calls = api_calls + ?, new_solves = new_solves + ?
+            WHERE run_id = ?
+        """, (cur.rowcount, api_calls, new_solves, run_id))
+        con.commit()
+
+# 실행을 끝내고 사용자별 체크포인트는 지운다 (통계는 sync_runs에 남는다)
+def finish_sync_run(run_id: int):
+    with get_db_connection() as con:
+        con.execute("UPDATE sync_runs SET finished_at = ? WHERE run_id = ?", (int(time.time()), run_id))
+        con.execute("DELETE FROM sync_run_users WHERE run_id = ?", (run_id,))
+        con.commit()
+
+# 최근 실행 통계 (최신순)
+def get_recent_sync_runs(limit: int = 5) -> list:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("SELECT * FROM sync_runs ORDER BY run_id DESC LIMIT ?", (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+
+# ==================== 사용자별 동기화 주기 관련 함수 ====================
+
+# 동기화할 때가 된 사용자 (오래 기다린 사용자부터, 주기가 없는 새 사용자가 가장 먼저)
+def get_users_due_for_sync(now: int) -> list:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("""
+            SELECT u.solvedac_handle
+            FROM users u
+            LEFT JOIN user_sync_schedule s ON s.solvedac_handle = u.solvedac_handle
+            WHERE s.next_sync_at IS NULL OR s.next_sync_at <= ?
+            ORDER BY COALESCE(s.next_sync_at, 0)
+        """, (now,))
+        return [row['solvedac_handle'] for row in cursor.fetchall()]
+
+# 사용자별 동기화 주기와 그룹/라이벌 여부 ({핸들: {"sync_interval", "solve_rate", "last_synced_at", "social"}})
+# 주기가 아직 없는 사용자는 sync_interval 등이 None
+def get_sync_schedules(solvedac_handles: list) -> dict:
+    schedules = {}
+    with get_db_connection() as con:
+        for i in range(0, len(solvedac_handles), MAX_QUERY_PARAMS):
+            chunk = solvedac_handles[i:i + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            rows = con.execute(f"""
+                SELECT u.solvedac_handle, s.sync_interval, s.solve_rate, s.last_synced_at,
+                       EXISTS (SELECT 1 FROM members m WHERE m.discord_id = u.discord_id)
+                       OR EXISTS (SELECT 1 FROM rival r WHERE r.my_id = u.solvedac_handle)
+                       OR EXISTS (SELECT 1 FROM rival r WHERE r.rival_id = u.solvedac_handle) AS social
+                FROM users u
+                LEFT JOIN user_sync_schedule s ON s.solvedac_handle = u.solvedac_handle
+                WHERE u.solvedac_handle IN ({placeholders})
+            """, chunk)
+            for row in rows:
+                schedules[row['solvedac_handle']] = {
+                    "sync_interval": row['sync_interval'],
+                    "solve_rate": row['solve_rate'],
+                    "last_synced_at": row['last_synced_at'],
+                    "social": bool(row['social'])
+                }
+    return schedules
+
+# 동기화 주기 저장 ([(핸들, 다음 동기화 시각, 주기, 하루 평균 푼 문제 수, 동기화한 시각)])
+def save_sync_schedules(schedules: list):
+    with get_db_connection() as con:
+        con.executemany("""
+            INSERT INTO user_sync_schedule (solvedac_handle, next_sync_at, sync_interval, solve_rate, last_synced_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (solvedac_handle) DO UPDATE SET
+                next_sync_at = excluded.next_sync_at,
+                sync_interval = excluded.sync_interval,
+                solve_rate = excluded.solve_rate,
+                last_synced_at = excluded.last_synced_at
+        """, schedules)
+        con.commit()
+
+# 마지막으로 푼 문제를 동기화한 시각 (한 번도 안 했으면 None)
+def get_last_synced(solvedac_handle: str) -> Optional[int]:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("SELECT last_synced_at FROM user_sync_schedule WHERE solvedac_handle = ?", (solvedac_handle,))
+        result = cursor.fetchone()
+        return result['last_synced_at'] if result else None
+
+# 그룹에 들어가거나 라이벌이 생긴 사용자는 다음 동기화 때 바로 처리해서 주기를 다시 계산하게 한다
+def _mark_sync_due(con, solvedac_handles: list):
+    now = int(time.time())
+    con.executemany(
+        "UPDATE user_sync_schedule SET next_sync_at = MIN(next_sync_at, ?) WHERE solvedac_handle = ?",
+        [(now, handle) for handle in solvedac_handles]
+    )
+
+# ==================== 문제 정보 테이블 관련 함수 ====================
+
+# 문제 정보 여러 개를 한 번에 저장 (이미 있으면 갱신)
+def upsert_problems(problems: list):
+    now = int(time.time())
+    upsert_data = [
+        (p['problemId'], p.get('titleKo'), p.get('title'), p.get('level'), json.dumps(p.get('tags') or [], ensure_ascii=False), now)
+        for p in problems
+    ]
+    if not upsert_data:
+        return
+    with get_db_connection() as con:
+        con.executemany("""
+            INSERT INTO problems (problem_id, title_ko, title, level, tags, fetched_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(problem_id) DO UPDATE SET
+                title_ko = excluded.title_ko,
+                title = excluded.title,
+                level = excluded.level,
+                tags = excluded.tags,
+                fetched_at = excluded.fetched_at
+        """, upsert_data)
+        con.commit()
+
+# 저장된 문제 정보 가져오기 ({문제 번호: 문제 정보})
+def get_problems_info(problem_ids: list) -> dict:
+    unique_ids = list(dict.fromkeys(problem_ids))
+    result = {}
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        for i in range(0, len(unique_ids), MAX_QUERY_PARAMS):
+            chunk = unique_ids[i:i + MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT * FROM problems WHERE problem_id IN ({placeholders})", chunk)
+            for row in cursor.fetchall():
+                result[row['problem_id']] = {
+                    'problemId': row['problem_id'],
+                    'titleKo': row['title_ko'],
+                    'title': row['title'],
+                    'level': row['level'],
+                    'tags': json.loads(row['tags']) if row['tags'] else [],
+                    'fetchedAt': row['fetched_at']
+                }
+    return result
+
+# 가장 큰 문제 번호 (새 문제 확인용)
+def get_max_problem_id() -> Optional[int]:
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        cursor.execute("SELECT MAX(problem_id) AS max_id FROM problems")
+        result = cursor.fetchone()
+        return result['max_id'] if result else None
+
+# 문제 번호 앞자리 또는 제목으로 문제 검색 (자동 완성용, [(문제 번호, 제목)])
+def search_problems(query: str, limit: int = 25) -> list:
+    query = query.strip()
+    if not query:
+        return []
+
+    # "²" 같은 문자도 isdigit()이 True라 숫자 검색은 ASCII 숫자만, 문제 번호는 6자리까지
+    is_number = query.isascii() and query.isdigit()
+    if is_number and len(query) >= 7:
+        return []
+
+    with get_db_connection() as con:
+        cursor = con.cursor()
+        if is_number:
+            # 번호 앞자리가 같은 문제: 1 -> 1, 10~19, 100~199, ... (기본 키 범위 검색)
+            prefix = int(query)
+            ranges = [(prefix * 10 ** k, (prefix + 1) * 10 ** k) for k in range(0, 7 - len(query))]
+            conditions = " OR ".join("(problem_id >= ? AND problem_id < ?)" for _ in ranges)
+            params = [bound for r in ranges for bound in r]
+            cursor.execute(f"SELECT problem_id, title_ko, title FROM problems WHERE {conditions} ORDER BY problem_id LIMIT ?", (*params, limit))
+        else:
+            # 단어마다 접두어 검색: "가장 큰" -> "가장"* "큰"*
+            match_query = " ".join('"' + token.replace('"', '""') + '"*' for token in query.split())
+            try:
+                cursor.execute("""
+                    SELECT p.problem_id, p.title_ko, p.title
+                    FROM problems_fts f
+                    JOIN problems p ON p.problem_id = f.rowid
+                    WHERE problems_fts MATCH ?
+                    ORDER BY f.rank
+                    LIMIT ?
+                """, (match_query, limit))
+            except sqlite3.OperationalError as e:
+                print(f"search_problems() Error: {e}")
+                return []
+        return [(row['problem_id'], row['title_ko'] or row['title'] or "") for row in cursor.fetchall()]
@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+# 부하 테스트용 solved.ac 대역 서버
+# 실행 후 SOL2_API_BASE_URL=http://127.0.0.1:8080/api/v3 로 봇/벤치마크가 이 서버를 보게 한다
+#
+#   python fake_solved_ac.py serve --users 500 --latency 80 --error-rate 0.01 --throttle-rate 0.02
+#   python fake_solved_ac.py serve --fixtures fixtures.json
+#   python fake_solved_ac.py record --handles alice bob --out fixtures.json
+
+API_PREFIX = "/api/v3"
+REAL_BASE_URL = "https://solved.ac/api/v3"
+SEARCH_PAGE_SIZE = 50
+
+TAG_KEYS = ["math", "implementation", "dp", "graphs", "greedy", "string", "bruteforcing", "data_structures", "sorting", "binary_search"]
+
+class FakeSolvedAc:
+    def __init__(self, problems: dict, users: dict, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 1.0, seed: int|None = None):
+        self.problems = problems
+        self.users = users
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.stats = Counter()
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._fault_middleware])
+        app.router.add_get(f"{API_PREFIX}/problem/show", self.problem_show)
+        app.router.add_get(f"{API_PREFIX}/problem/lookup", self.problem_lookup)
+        app.router.add_get(f"{API_PREFIX}/search/suggestion", self.search_suggestion)
+        app.router.add_get(f"{API_PREFIX}/search/user", self.search_user)
+        app.router.add_get(f"{API_PREFIX}/user/show", self.user_show)
+        app.router.add_get(f"{API_PREFIX}/search/problem", self.search_problem)
+        app.router.add_get(f"{API_PREFIX}/user/top_100", self.user_top100)
+        app.router.add_get("/_stats", self.get_stats)
+        return app
+
+    # 지연, 5xx 오류, 429 응답을 설정한 비율대로 섞는다
+    @web.middleware
+    async def _fault_middleware(self, request: web.Request, handler):
+        if request.path == "/_stats":
+            return await handler(request)
+        self.stats[request.path] += 1
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            self.stats["429"] += 1
+            return web.json_response({"message": "Too Many Requests"}, status=429, headers={"Retry-After": str(self.retry_after)})
+        if roll < self.throttle_rate + self.error_rate:
+            self.stats["500"] += 1
+            return web.json_response({"message": "Internal Server Error"}, status=500)
+        return await handler(request)
+
+    async def problem_show(self, request: web.Request):
+        problem = self.problems.get(_int_or_none(request.query.get("problemId")))
+        if problem is None:
+            return web.Response(status=404)
+        return web.json_response(problem)
+
+    async def problem_lookup(self, request: web.Request):
+        problem_ids = [_int_or_none(pid) for pid in request.query.get("problemIds", "").split(",")]
+        return web.json_response([self.problems[pid] for pid in problem_ids if pid in self.problems])
+
+    async def search_suggestion(self, request: web.Request):
+        query = request.query.get("query", "").lower()
+        problems = [
+            {"id": p["problemId"], "title": p["titleKo"], "tier": p["level"]}
+            for p in self.problems.values()
+            if query and (query in p["titleKo"].lower() or str(p["problemId"]).startswith(query))
+        ][:10]
+        users = [{"handle": h, "solvedCount": len(s)} for h, s in self.users.items() if query and h.lower().startswith(query)][:5]
+        return web.json_response({"autocomplete": [], "problems": problems, "problemCount": len(problems), "users": users, "userCount": len(users), "tags": [], "tagCount": 0})
+
+    async def search_user(self, request: web.Request):
+        query = request.query.get("query", "").lower()
+        items = [self._user_item(h) for h in self.users if query and h.lower().startswith(query)]
+        return web.json_response({"count": len(items), "items": items[:SEARCH_PAGE_SIZE]})
+
+    async def search_problem(self, request: web.Request):
+        query = request.query.get("query", "")
+        page = max(1, _int_or_none(request.query.get("page")) or 1)
+        if query.startswith("solved_by:"):
+            problem_ids = self.users.get(query[len("solved_by:"):], [])
+        else:
+            problem_ids = [pid for pid, p in self.problems.items() if query.lower() in p["titleKo"].lower()]
+        problem_ids = sorted(problem_ids, reverse=request.query.get("direction") == "desc")
+        page_ids = problem_ids[(page - 1) * SEARCH_PAGE_SIZE:page * SEARCH_PAGE_SIZE]
+        return web.json_response({"count": len(problem_ids), "items": [self.problems[pid] for pid in page_ids if pid in self.problems]})
+
+    async def user_show(self, request: web.Request):
+        handle = request.query.get("handle", "")
+        if handle not in self.users:
+            return web.Response(status=404)
+        return web.json_response(self._user_item(handle))
+
+    async def user_top100(self, request: web.Request):
+        solved = self.users.get(request.query.get("handle", ""))
+        if solved is None:
+            return web.Response(status=404)
+        problems = [self.problems[pid] for pid in solved if pid in self.problems]
+        problems.sort(key=lambda p: (p["level"], p["problemId"]), reverse=True)
+        return web.json_response({"count": min(100, len(problems)), "items": problems[:100]})
+
+    async def get_stats(self, request: web.Request):
+        return web.json_response(dict(self.stats))
+
+    def _user_item(self, handle: str) -> dict:
+        return {"handle": handle, "solvedCount": len(self.users[handle]), "tier": 0, "rating": 0}
+
+def _int_or_none(value: str|None) -> int|None:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+# ==================== 데이터 생성 / 불러오기 ====================
+
+# 시드가 같으면 항상 같은 문제와 사용자를 만든다
+def generate_data(problem_count: int, user_count: int, seed: int) -> tuple:
+    rng = random.Random(seed)
+    problems = {}
+    for problem_id in range(1000, 1000 + problem_count):
+        problems[problem_id] = {
+            "problemId": problem_id,
+            "titleKo": f"문제 {problem_id} {rng.choice(['수열', '그래프', '트리', '문자열', '경로', '합'])}",
+            "title": f"Problem {problem_id}",
+            "isSolvable": True,
+            "acceptedUserCount": rng.randint(0, 100000),
+            "level": rng.randint(1, 30),
+            "tags": [{"key": key} for key in rng.sample(TAG_KEYS, rng.randint(1, 3))]
+        }
+
+    problem_ids = list(problems)
+    users = {}
+    for i in range(1, user_count + 1):
+        # 대부분은 적게, 일부는 아주 많이 푼 사용자가 되도록 파레토 분포 사용
+        solved_count = min(len(problem_ids), int(rng.paretovariate(1.2) * 20))
+        users[f"user{i}"] = sorted(rng.sample(problem_ids, solved_count))
+    return problems, users
+
+# 기록된 픽스처 형식: {"problems": [solved.ac 문제 객체...], "users": {"handle": [문제 번호...]}}
+def load_fixtures(path: str) -> tuple:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    problems = {p["problemId"]: p for p in data.get("problems", [])}
+    users = {handle: list(solved) for handle, solved in data.get("users", {}).items()}
+    return problems, users
+
+# 실제 solved.ac에서 사용자들의 푼 문제를 받아 픽스처로 저장한다
+async def record_fixtures(handles: list, out_path: str, base_url: str = REAL_BASE_URL):
+    problems = {}
+    users = {}
+    headers = {"x-solvedac-language": "ko", "Accept": "application/json"}
+    async with aiohttp.ClientSession(headers=headers) as session:
+        for handle in handles:
+            solved = []
+            page = 1
+            while True:
+                params = {"query": f"solved_by:{handle}", "sort": "id", "direction": "asc", "page": str(page)}
+                async with session.get(f"{base_url}/search/problem", params=params) as response:
+                    response.raise_for_status()
+                    result = await response.json(content_type=None)
+                items = result.get("items", [])
+                for item in items:
+                    problems[item["problemId"]] = item
+                    solved.append(item["problemId"])
+                if not items or page * SEARCH_PAGE_SIZE >= result.get("count", 0):
+                    break
+                page += 1
+                # 실제 서버에 부담을 주지 않도록 천천히 받는다
+                await asyncio.sleep(1.0)
+            users[handle] = solved
+            print(f"{handle}: {len(solved)} problems")
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"problems": list(problems.values()), "users": users}, f, ensure_ascii=False)
+
+# ==================== 실행 ====================
+
+def main():
+    parser = argparse.ArgumentParser(description="solved.ac 대역 서버")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="대역 서버 실행")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--fixtures", help="기록된 픽스처 JSON 파일 (없으면 합성 데이터 사용)")
+    serve.add_argument("--problems", type=int, default=5000, help="합성 문제 수")
+    serve.add_argument("--users", type=int, default=200, help="합성 사용자 수 (user1, user2, ...)")
+    serve.add_argument("--seed", type=int, default=2, help="합성 데이터 및 오류 주입 시드")
+    serve.add_argument("--latency", type=float, default=0.0, help="응답 지연(ms)")
+    serve.add_argument("--jitter", type=float, default=0.0, help="응답 지연 편차(ms)")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    serve.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After(초)")
+
+    record = subparsers.add_parser("record", help="실제 solved.ac에서 픽스처 기록")
+    record.add_argument("--handles", nargs="+", required=True)
+    record.add_argument("--out", default="fixtures.json")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record_fixtures(args.handles, args.out))
+        return
+
+    if args.fixtures:
+        problems, users = load_fixtures(args.fixtures)
+    else:
+        problems, users = generate_data(args.problems, args.users, args.seed)
+
+    fake = FakeSolvedAc(
+        problems, users,
+        latency=args.latency / 1000, jitter=args.jitter / 1000,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"문제 {len(problems)}개, 사용자 {len(users)}명으로 http://{args.host}:{args.port}{API_PREFIX} 에서 실행합니다.")
+    web.run_app(fake.make_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import threading
+from typing import Optional
+
+# 명령어마다 처음에 확인하는 사용자/그룹 정보 메모리 캐시
+#   discord_id <-> solved.ac 핸들, group_id -> 그룹 정보, (server_id, channel_id) -> group_id
+# 봇 시작 시 db_manager.build_name_index()가 전부 채우고, 이후로는 db_manager의 쓰기 함수가 바로 갱신한다
+# 채워지기 전(스크립트 등)에는 is_loaded()가 False이므로 db_manager가 SQL로 조회한다
+
+_lock = threading.Lock()
+_loaded = False
+_handles: dict = {}         # {discord_id: 핸들}
+_discord_ids: dict = {}     # {핸들: discord_id}
+_groups: dict = {}          # {group_id: {"group_id", "group_name", "server_id", "channel_id", "manager_id"}}
+_group_channels: dict = {}  # {(server_id, channel_id): [group_id...]}, 한 채널에 그룹이 여럿이면 먼저 만든 그룹
+
+def is_loaded() -> bool:
+    return _loaded
+
+# users: [(discord_id, 핸들)], groups: [그룹 정보]
+def replace_all(users: list, groups: list):
+    global _loaded, _handles, _discord_ids, _groups, _group_channels
+    handles = dict(users)
+    group_channels = {}
+    for group in sorted(groups, key=lambda group: group["group_id"]):
+        group_channels.setdefault((group["server_id"], group["channel_id"]), []).append(group["group_id"])
+    with _lock:
+        _handles = handles
+        _discord_ids = {handle: discord_id for discord_id, handle in handles.items()}
+        _groups = {group["group_id"]: dict(group) for group in groups}
+        _group_channels = group_channels
+        _loaded = True
+
+# 캐시를 비우고 다시 채울 때까지 SQL로 조회하게 한다
+def clear():
+    global _loaded
+    with _lock:
+        _loaded = False
+        _handles.clear()
+        _discord_ids.clear()
+        _groups.clear()
+        _group_channels.clear()
+
+def add_user(discord_id: int, solvedac_handle: str):
+    with _lock:
+        _handles[discord_id] = solvedac_handle
+        _discord_ids[solvedac_handle] = discord_id
+
+def get_handle(discord_id: int) -> Optional[str]:
+    with _lock:
+        return _handles.get(discord_id)
+
+def get_discord_id(solvedac_handle: str) -> Optional[int]:
+    with _lock:
+        return _discord_ids.get(solvedac_handle)
+
+def add_group(group: dict):
+    with _lock:
+        _groups[group["group_id"]] = dict(group)
+        group_ids = _group_channels.setdefault((group["server_id"], group["channel_id"]), [])
+        group_ids.append(group["group_id"])
+        group_ids.sort()
+
+def remove_group(group_id: int):
+    with _lock:
+        group = _groups.pop(group_id, None)
+        if group is None:
+            return
+        key = (group["server_id"], group["channel_id"])
+        group_ids = _group_channels.get(key, [])
+        if group_id in group_ids:
+            group_ids.remove(group_id)
+        if not group_ids:
+            _group_channels.pop(key, None)
+
+def get_group(group_id: int) -> Optional[dict]:
+    with _lock:
+        group = _groups.get(group_id)
+        return dict(group) if group else None
+
+# SQL의 "server_id = ? AND channel_id = ?"처럼 NULL은 어떤 그룹과도 맞지 않는다
+def get_group_id(server_id: int|None, channel_id: int|None) -> Optional[int]:
+    if server_id is None or channel_id is None:
+        return None
+    with _lock:
+        group_ids = _group_channels.get((server_id, channel_id))
+        return group_ids[0] if group_ids else None
@@ -0,0 +1,122 @@
+import bisect
+import os
+import time
+from collections import Counter
+
+# solved.ac 요청 지표 (엔드포인트별 요청 수, 상태 코드별 오류 수, 재시도 수, 지연 히스토그램, 받은 바이트)
+# 요청마다 카운터 몇 개만 올리므로 부담이 거의 없다
+
+# 지연 히스토그램 구간 상한(초). 마지막 구간은 +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.bytes_received = 0
+        self.errors = Counter()
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    def observe_latency(self, seconds: float):
+        self.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latency_sum += seconds
+
+    # 히스토그램 구간 안에서 선형 보간한 백분위 지연(초)
+    def percentile(self, q: float) -> float|None:
+        total = sum(self.latency_counts)
+        if total == 0:
+            return None
+        rank = q * total
+        seen = 0
+        for i, count in enumerate(self.latency_counts):
+            if count and seen + count >= rank:
+                lower = LATENCY_BUCKETS[i - 1] if i > 0 else 0.0
+                upper = LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return LATENCY_BUCKETS[-1]
+
+_endpoints: dict = {}
+_started_at = time.time()
+
+def _get(endpoint: str) -> EndpointMetrics:
+    metrics = _endpoints.get(endpoint)
+    if metrics is None:
+        metrics = _endpoints[endpoint] = EndpointMetrics()
+    return metrics
+
+# HTTP 요청 한 번(재시도 포함 각 시도)이 끝났을 때 기록
+# status는 HTTP 상태 코드, 연결 실패는 "network", 시간 초과는 "timeout"
+def record_request(endpoint: str, status: int|str, seconds: float, bytes_received: int = 0):
+    metrics = _get(endpoint)
+    metrics.requests += 1
+    metrics.bytes_received += bytes_received
+    metrics.observe_latency(seconds)
+    if not isinstance(status, int) or status >= 400:
+        metrics.errors[str(status)] += 1
+
+def record_retry(endpoint: str):
+    _get(endpoint).retries += 1
+
+def reset():
+    _endpoints.clear()
+
+# 엔드포인트별 요약 ({엔드포인트: {...}})
+def get_summary() -> dict:
+    summary = {}
+    for endpoint, metrics in sorted(_endpoints.items()):
+        summary[endpoint] = {
+            "requests": metrics.requests,
+            "retries": metrics.retries,
+            "errors": dict(metrics.errors),
+            "bytes": metrics.bytes_received,
+            "p50": metrics.percentile(0.50),
+            "p95": metrics.percentile(0.95),
+            "p99": metrics.percentile(0.99)
+        }
+    return summary
+
+# Prometheus 텍스트 형식으로 변환 (extra_counters: {지표 이름: 값})
+def render_prometheus(extra_counters: dict|None = None) -> str:
+    lines = [
+        "# HELP sol2_api_requests_total solved.ac HTTP requests (each attempt).",
+        "# TYPE sol2_api_requests_total counter"
+    ]
+    for endpoint, metrics in sorted(_endpoints.items()):
+        lines.append(f'sol2_api_requests_total{{endpoint="{endpoint}"}} {metrics.requests}')
+
+    lines += ["# HELP sol2_api_errors_total solved.ac failed requests by status.", "# TYPE sol2_api_errors_total counter"]
+    for endpoint, metrics in sorted(_endpoints.items()):
+        for status, count in sorted(metrics.errors.items()):
+            lines.append(f'sol2_api_errors_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+    lines += ["# HELP sol2_api_retries_total solved.ac request retries.", "# TYPE sol2_api_retries_total counter"]
+    for endpoint, metrics in sorted(_endpoints.items()):
+        lines.append(f'sol2_api_retries_total{{endpoint="{endpoint}"}} {metrics.retries}')
+
+    lines += ["# HELP sol2_api_received_bytes_total solved.ac response bytes.", "# TYPE sol2_api_received_bytes_total counter"]
+    for endpoint, metrics in sorted(_endpoints.items()):
+        lines.append(f'sol2_api_received_bytes_total{{endpoint="{endpoint}"}} {metrics.bytes_received}')
+
+    lines += ["# HELP sol2_api_request_duration_seconds solved.ac request latency.", "# TYPE sol2_api_request_duration_seconds histogram"]
+    for endpoint, metrics in sorted(_endpoints.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), metrics.latency_counts):
+            cumulative += count
+            lines.append(f'sol2_api_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+        lines.append(f'sol2_api_request_duration_seconds_sum{{endpoint="{endpoint}"}} {metrics.latency_sum:.6f}')
+        lines.append(f'sol2_api_request_duration_seconds_count{{endpoint="{endpoint}"}} {cumulative}')
+
+    for name, value in (extra_counters or {}).items():
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+
+    lines += ["# TYPE sol2_process_start_time_seconds gauge", f"sol2_process_start_time_seconds {_started_at:.0f}"]
+    return "\n".join(lines) + "\n"
+
+# 스크레이퍼가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 교체한다
+def write_snapshot(path: str, extra_counters: dict|None = None):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus(extra_counters))
+    os.replace(tmp_path, path)
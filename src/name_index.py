@@ -0,0 +1,56 @@
+import bisect
+import threading
+
+# 자동 완성용 메모리 접두어 색인
+# 범위(scope)마다 소문자 이름을 정렬해 두고 bisect로 접두어 구간을 찾는다
+# db_manager의 추가/삭제 함수가 직접 갱신하므로 자동 완성은 SQLite를 거치지 않는다
+
+class PrefixIndex:
+    def __init__(self):
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, scope, name: str):
+        entry = (name.lower(), name)
+        with self._lock:
+            entries = self._entries.setdefault(scope, [])
+            i = bisect.bisect_left(entries, entry)
+            if i == len(entries) or entries[i] != entry:
+                entries.insert(i, entry)
+
+    def remove(self, scope, name: str):
+        entry = (name.lower(), name)
+        with self._lock:
+            entries = self._entries.get(scope)
+            if not entries:
+                return
+            i = bisect.bisect_left(entries, entry)
+            if i < len(entries) and entries[i] == entry:
+                del entries[i]
+
+    def remove_scope(self, scope):
+        with self._lock:
+            self._entries.pop(scope, None)
+
+    def replace_all(self, entries_by_scope: dict):
+        entries = {scope: sorted({(name.lower(), name) for name in names}) for scope, names in entries_by_scope.items()}
+        with self._lock:
+            self._entries = entries
+
+    def search(self, scope, prefix: str, limit: int = 25) -> list:
+        key = prefix.lower()
+        with self._lock:
+            entries = self._entries.get(scope, [])
+            i = bisect.bisect_left(entries, (key,))
+            result = []
+            while i < len(entries) and len(result) < limit and entries[i][0].startswith(key):
+                result.append(entries[i][1])
+                i += 1
+            return result
+
+# 그룹별 문제집 이름 (scope: group_id)
+set_names = PrefixIndex()
+# solved.ac 핸들 (scope: None)
+handles = PrefixIndex()
+# 서버별 그룹 이름 (scope: server_id)
+group_names = PrefixIndex()
@@ -0,0 +1,184 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import discord
+
+# 긴 목록을 버튼으로 넘겨 보는 View
+# 보고 있는 페이지만 그리고(문제 제목도 그 페이지 것만 가져온다), 다음 페이지는 백그라운드로 미리 그려 둔다
+# 목록이 아무리 길어도 첫 응답은 첫 페이지만큼만 걸린다
+#
+#   view = PaginatedView(count_pages, render_page, interaction.user.id)
+#   if await view.reload():
+#       embed = await view.current_embed()
+#       view.attach(await interaction.followup.send(embed=embed, view=view, ephemeral=True, wait=True))
+#
+#   count_pages()                 -> 전체 페이지 수 (목록이 비었으면 0), reload()마다 다시 호출
+#   render_page(page, page_count) -> 해당 페이지 Embed
+#
+# 페이지를 그린 뒤에 내용이 채워지면(예: 문제 제목을 나중에 가져옴) refresh_page(page)를 부른다
+# 보고 있는 페이지면 메시지를 다시 그려 고치되, 여러 번 불려도 EDIT_INTERVAL초에 한 번만 고친다
+# 메시지 수정은 모두 _apply()를 거쳐 한 번에 하나씩 하므로, 늦게 끝난 수정이 넘긴 페이지를 덮어쓰지 않는다
+
+# 버튼을 누를 수 있는 시간(초), 비공개 응답은 15분이 지나면 고칠 수 없다
+VIEW_TIMEOUT = 600
+# 메시지를 고치는 최소 간격(초), 같은 메시지를 짧은 시간에 여러 번 고치면 디스코드가 요청을 제한한다
+EDIT_INTERVAL = 1.0
+
+class _JumpModal(discord.ui.Modal, title="페이지 이동"):
+    page = discord.ui.TextInput(label="페이지 번호", max_length=6)
+
+    def __init__(self, paginated_view: "PaginatedView"):
+        super().__init__()
+        self.paginated_view = paginated_view
+        self.page.placeholder = f"1 ~ {paginated_view.page_count}"
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            page = int(self.page.value)
+        except ValueError:
+            await interaction.response.send_message("페이지 번호는 숫자로 입력해 주세요.", ephemeral=True)
+            return
+        await self.paginated_view.show(interaction, page)
+
+class PaginatedView(discord.ui.View):
+    def __init__(self, count_pages: Callable[[], Awaitable[int]], render_page: Callable[[int, int], Awaitable[discord.Embed]],
+                 author_id: int, page: int = 1):
+        super().__init__(timeout=VIEW_TIMEOUT)
+        self.count_pages = count_pages
+        self.render_page = render_page
+        self.author_id = author_id
+        self.page = page
+        self.page_count = 0
+        self.message: Optional[discord.WebhookMessage] = None
+        self._pages: dict = {}  # {페이지: 그리는 중이거나 다 그린 Task}
+        self._shown: Optional[asyncio.Task] = None  # 메시지에 보여 준 페이지를 그린 Task
+        self._edit_task: Optional[asyncio.Task] = None
+        self._edit_lock = asyncio.Lock()
+        self._last_edit = 0.0
+
+    # 목록을 다시 읽고 그려 둔 페이지를 버린다 (전체 페이지 수 반환)
+    # 그리는 중인 페이지는 기다리는 쪽이 있을 수 있어 취소하지 않는다
+    async def reload(self) -> int:
+        self._pages.clear()
+        self.page_count = await self.count_pages()
+        self.page = min(max(self.page, 1), max(self.page_count, 1))
+        self._update_buttons()
+        return self.page_count
+
+    # 현재 페이지를 그리고 다음 페이지를 미리 그리기 시작한다
+    async def current_embed(self) -> discord.Embed:
+        self._shown = self._render(self.page)
+        embed = await self._shown
+        if self.page < self.page_count:
+            self._render(self.page + 1)
+        return embed
+
+    def _render(self, page: int) -> asyncio.Task:
+        task = self._pages.get(page)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = asyncio.create_task(self.render_page(page, self.page_count))
+            self._pages[page] = task
+        return task
+
+    async def show(self, interaction: discord.Interaction, page: int):
+        self.page = min(max(page, 1), self.page_count)
+        self._update_buttons()
+        await interaction.response.defer()
+        await self._apply(interaction.edit_original_response)
+
+    # 보낸(또는 고친) 메시지를 붙인다, 그리는 사이에 현재 페이지 내용이 바뀌었으면 바로 다시 고친다
+    def attach(self, message: discord.WebhookMessage):
+        self.message = message
+        self._edited()
+
+    # 다른 내용을 보여 주던 메시지(예: 안내 문구)를 현재 페이지로 고치고 붙인다
+    async def edit_message(self, message: discord.WebhookMessage):
+        self.message = message
+        await self._apply(message.edit, content=None)
+
+    # 페이지 대신 안내 문구를 보여 주고 버튼을 없앤다 (목록이 비었을 때)
+    async def replace_message(self, message: discord.WebhookMessage, content: str):
+        self.stop()
+        async with self._edit_lock:
+            await message.edit(content=content, embed=None, view=None)
+
+    # 현재 페이지를 그려 edit(embed=..., view=self)로 메시지를 고친다
+    # 그리는 사이에 페이지가 넘어갔으면 넘어간 페이지를 다시 그린다
+    async def _apply(self, edit: Callable[..., Awaitable], **kwargs):
+        async with self._edit_lock:
+            page = None
+            while page != self.page:
+                page = self.page
+                embed = await self.current_embed()
+            await edit(embed=embed, view=self, **kwargs)
+            self._edited()
+
+    # page를 다시 그리게 한다, 보고 있는 페이지면 메시지도 고친다
+    def refresh_page(self, page: int):
+        self._pages.pop(page, None)
+        if page == self.page:
+            self._schedule_edit()
+
+    def _edited(self):
+        self._last_edit = time.monotonic()
+        if self._pages.get(self.page) is not self._shown:
+            self._schedule_edit()
+
+    def _schedule_edit(self):
+        if self.message is None or self._edit_task is not None or self.is_finished():
+            return
+        self._edit_task = asyncio.create_task(self._edit_later())
+
+    async def _edit_later(self):
+        await asyncio.sleep(max(self._last_edit + EDIT_INTERVAL - time.monotonic(), 0))
+        # 다시 그리는 동안 들어온 refresh_page()는 다음 수정으로 넘긴다
+        self._edit_task = None
+        if self.is_finished():
+            return
+        try:
+            await self._apply(self.message.edit)
+        except discord.HTTPException as e:
+            print(f"PaginatedView 메시지 수정 실패: {e}")
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= self.page_count
+        self.page_indicator.label = f"{self.page}/{max(self.page_count, 1)}"
+        self.jump_to_page.disabled = self.page_count <= 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("명령어를 실행한 사람만 페이지를 넘길 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def on_timeout(self):
+        for task in self._pages.values():
+            task.cancel()
+        if self._edit_task is not None:
+            self._edit_task.cancel()
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                async with self._edit_lock:
+                    await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.secondary, disabled=True)
+    async def page_indicator(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, self.page + 1)
+
+    @discord.ui.button(label="이동", style=discord.ButtonStyle.primary)
+    async def jump_to_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.send_modal(_JumpModal(self))
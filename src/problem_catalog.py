@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import json
+
+import db_manager as db
+import async_db
+import solved_ac_api as api
+
+# 로컬 문제 목록 (problems 테이블 + problems_fts 색인) 관리
+#
+#   python problem_catalog.py import problems.json   # 문제 덤프 한 번에 불러오기
+#   python problem_catalog.py refresh                # solved.ac에서 새 문제만 추가
+#   python problem_catalog.py search 히스토그램
+
+IMPORT_BATCH_SIZE = 1000
+# 새 문제 확인 시 빈 구간이 이만큼 연속되면 마지막 문제로 본다
+MAX_EMPTY_CHUNKS = 3
+
+# solved.ac 문제 객체 덤프(JSON 배열 또는 한 줄에 하나씩인 JSON Lines)를 불러오기
+def import_dump(path: str) -> int:
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        items = json.loads(stripped)
+    elif stripped.startswith("{") and '"items"' in stripped[:200]:
+        items = json.loads(stripped).get("items", [])
+    else:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    problems = [api.to_problem_info(item) for item in items if isinstance(item, dict) and item.get('problemId') is not None]
+    for i in range(0, len(problems), IMPORT_BATCH_SIZE):
+        db.upsert_problems(problems[i:i + IMPORT_BATCH_SIZE])
+    return len(problems)
+
+# 저장된 가장 큰 문제 번호 뒤로 새 문제가 있는지 확인해 추가 (추가한 문제 수 반환)
+async def refresh_new_problems() -> int:
+    next_id = max(await async_db.get_max_problem_id() or 0, 999) + 1
+    added = 0
+    empty_chunks = 0
+    with api.background_priority():
+        while empty_chunks < MAX_EMPTY_CHUNKS:
+            chunk = list(range(next_id, next_id + api.LOOKUP_CHUNK_SIZE))
+            problems = await api.get_problems(chunk)
+            if problems:
+                added += len(problems)
+                empty_chunks = 0
+            else:
+                empty_chunks += 1
+            next_id += api.LOOKUP_CHUNK_SIZE
+    return added
+
+async def _refresh():
+    try:
+        print(f"새 문제 {await refresh_new_problems()}개를 추가했습니다.")
+    finally:
+        await api.close_session()
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 문제 목록 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="문제 덤프 불러오기")
+    import_parser.add_argument("path")
+    subparsers.add_parser("refresh", help="새 문제 추가")
+    search_parser = subparsers.add_parser("search", help="문제 검색")
+    search_parser.add_argument("query")
+    args = parser.parse_args()
+
+    db.init_db()
+    if args.command == "import":
+        print(f"문제 {import_dump(args.path)}개를 불러왔습니다.")
+    elif args.command == "refresh":
+        asyncio.run(_refresh())
+    elif args.command == "search":
+        for problem_id, title in db.search_problems(args.query):
+            print(f"{problem_id}\t{title}")
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,378 @@
-import requests
+import aiohttp
 import asyncio
+import os
+import random
+import time
+import contextvars
+import json
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
 
-BASE_URL = "https://solved.ac/api/v3"
+import async_db as db
+import metrics
 
+# 부하 테스트 시 SOL2_API_BASE_URL로 대역 서버(fake_solved_ac.py)를 가리킬 수 있다
+BASE_URL = os.getenv("SOL2_API_BASE_URL", "https://solved.ac/api/v3")
+
+# 커넥션 풀 설정 (solved.ac 한 호스트만 사용하므로 호스트당 제한이 곧 전체 제한)
+CONNECTION_LIMIT = 20
+CONNECTION_LIMIT_PER_HOST = 10
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 10
+CONNECT_TIMEOUT = 5
+
+# /problem/lookup 한 번에 조회할 수 있는 최대 문제 수
+LOOKUP_CHUNK_SIZE = 100
+
+# /search/problem 한 페이지당 문제 수
+SEARCH_PAGE_SIZE = 50
+
+# 문제 정보 캐시 유효 시간(초). 지나면 캐시를 그대로 쓰면서 백그라운드에서 갱신한다
+PROBLEM_CACHE_TTL = int(os.getenv("SOL2_PROBLEM_CACHE_TTL", str(7 * 24 * 60 * 60)))
+
+# 메모리 응답 캐시 최대 항목 수 (가장 오래 안 쓴 항목부터 제거)
+RESPONSE_CACHE_SIZE = 1024
+
+# 엔드포인트별 메모리 응답 캐시 유지 시간(초). 없는 엔드포인트는 캐시하지 않는다
+ENDPOINT_CACHE_TTL = {
+	"/problem/show": 600,
+	"/problem/lookup": 600,
+	"/search/suggestion": 60,
+	"/search/user": 60,
+	"/user/show": 60,
+	"/search/problem": 30,
+	"/user/top_100": 30
+}
+
+# solved.ac 요청 속도 제한 (기본값: 15분에 256회)
+RATE_LIMIT_PER_SECOND = float(os.getenv("SOL2_API_RATE", str(256 / 900)))
+RATE_LIMIT_BURST = int(os.getenv("SOL2_API_BURST", "256"))
+# 백그라운드 요청은 토큰이 이 비율 이상 남아 있을 때만 사용한다 (대화형 명령어 몫)
+BACKGROUND_RESERVE_RATIO = 0.2
+
+# 재시도 설정 (지수 백오프 + 지터, Retry-After 우선)
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 서킷 브레이커 설정: 연속 실패가 기준을 넘으면 일정 시간 동안 요청을 보내지 않는다
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30.0
+CIRCUIT_MAX_RESET_TIMEOUT = 300.0
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+_request_priority = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+# count_requests() 블록 안에서 실제로 solved.ac에 보낸 요청 수 (캐시 적중은 제외)
+_request_counter = contextvars.ContextVar("request_counter", default=None)
+
+_response_cache: OrderedDict = OrderedDict()
+_inflight_requests: dict = {}
+_cache_stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+_refreshing_problem_ids: set = set()
+_background_tasks: set = set()
+
+_session: aiohttp.ClientSession|None = None
+
+# 봇 수명 동안 재사용할 HTTP 세션 생성
+async def open_session() -> aiohttp.ClientSession:
+	global _session
+	if _session is None or _session.closed:
+		connector = aiohttp.TCPConnector(
+			limit=CONNECTION_LIMIT,
+			limit_per_host=CONNECTION_LIMIT_PER_HOST,
+			keepalive_timeout=KEEPALIVE_TIMEOUT,
+			ttl_dns_cache=300
+		)
+		timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+		_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+	return _session
+
+# 봇 종료 시 세션 정리
+async def close_session():
+	global _session
+	if _session is not None and not _session.closed:
+		await _session.close()
+	_session = None
+
+# 모든 solved.ac 요청이 공유하는 토큰 버킷
+# 429를 받으면 속도를 절반으로 줄이고, 성공할 때마다 조금씩 원래 속도로 되돌린다
+class RateLimiter:
+	def __init__(self, rate: float, burst: int):
+		self.max_rate = rate
+		self.min_rate = rate / 16
+		self.rate = rate
+		self.burst = burst
+		self.tokens = float(burst)
+		self.updated = time.monotonic()
+		self.blocked_until = 0.0
+		self._waiters = {PRIORITY_INTERACTIVE: deque(), PRIORITY_BACKGROUND: deque()}
+		self._dispatcher: asyncio.Task|None = None
+
+	async def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+		future = asyncio.get_running_loop().create_future()
+		self._waiters[priority].append(future)
+		if self._dispatcher is None or self._dispatcher.done():
+			self._dispatcher = asyncio.create_task(self._dispatch())
+		await future
+
+	def on_success(self):
+		self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+	def on_throttled(self, retry_after: float|None):
+		self.rate = max(self.min_rate, self.rate / 2)
+		self.tokens = 0.0
+		if retry_after is not None:
+			self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+	def _refill(self):
+		now = time.monotonic()
+		self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+
+	def _next_waiter(self) -> tuple|None:
+		for priority in (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND):
+			queue = self._waiters[priority]
+			while queue and queue[0].done():
+				queue.popleft()
+			if queue:
+				return priority, queue
+		return None
+
+	async def _dispatch(self):
+		while True:
+			waiter = self._next_waiter()
+			if waiter is None:
+				return
+			priority, queue = waiter
+
+			blocked = self.blocked_until - time.monotonic()
+			if blocked > 0:
+				await asyncio.sleep(blocked)
+				continue
+
+			self._refill()
+			needed = 1.0
+			if priority == PRIORITY_BACKGROUND:
+				needed += self.burst * BACKGROUND_RESERVE_RATIO
+			if self.tokens < needed:
+				# 기다리는 동안 대화형 요청이 들어오면 다음 반복에서 먼저 처리된다
+				await asyncio.sleep(min(1.0, (needed - self.tokens) / self.rate))
+				continue
+
+			self.tokens -= 1
+			queue.popleft().set_result(None)
+
+_rate_limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+class CircuitOpenError(Exception):
+	pass
+
+# solved.ac 장애 시 요청마다 시간 초과를 기다리지 않도록 바로 실패시킨다
+# closed: 정상 / open: 바로 실패 / half_open: 확인 요청 하나만 보내 보고 성공하면 closed
+class CircuitBreaker:
+	CLOSED = "closed"
+	OPEN = "open"
+	HALF_OPEN = "half_open"
+
+	def __init__(self, failure_threshold: int, reset_timeout: float, max_reset_timeout: float):
+		self.failure_threshold = failure_threshold
+		self.base_reset_timeout = reset_timeout
+		self.max_reset_timeout = max_reset_timeout
+		self.reset_timeout = reset_timeout
+		self.state = self.CLOSED
+		self.failures = 0
+		self.opened_at = 0.0
+		self.probe_started_at: float|None = None
+
+	def allow_request(self) -> bool:
+		if self.state == self.CLOSED:
+			return True
+		if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+			self.state = self.HALF_OPEN
+		if self.state == self.HALF_OPEN and not self._probe_in_flight():
+			self.probe_started_at = time.monotonic()
+			return True
+		return False
+
+	def record_success(self):
+		if self.state != self.CLOSED:
+			print("solved.ac 서킷 브레이커: 연결이 복구되었습니다.")
+		self.state = self.CLOSED
+		self.failures = 0
+		self.probe_started_at = None
+		self.reset_timeout = self.base_reset_timeout
+
+	def record_failure(self):
+		self.failures += 1
+		if self.state == self.HALF_OPEN:
+			# 확인 요청도 실패하면 다음 확인까지 더 오래 기다린다
+			self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+			self._open()
+		elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+			self._open()
+
+	# 다음 확인 요청을 보낼 수 있을 때까지 남은 시간(초)
+	def retry_in(self) -> float:
+		if self.state == self.CLOSED:
+			return 0.0
+		if self.state == self.HALF_OPEN:
+			return 1.0 if self._probe_in_flight() else 0.0
+		return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+	def _open(self):
+		if self.state != self.OPEN:
+			print(f"solved.ac 서킷 브레이커: {self.reset_timeout:.0f}초 동안 요청을 중단합니다.")
+		self.state = self.OPEN
+		self.opened_at = time.monotonic()
+		self.probe_started_at = None
+
+	# 확인 요청이 취소되어 결과가 기록되지 않아도 멈춰 있지 않도록 시간 초과 후에는 새 확인을 허용한다
+	def _probe_in_flight(self) -> bool:
+		return self.probe_started_at is not None and time.monotonic() - self.probe_started_at < REQUEST_TIMEOUT * 2
+
+_circuit_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT, CIRCUIT_MAX_RESET_TIMEOUT)
+
+# solved.ac에 정상적으로 요청할 수 있는 상태인지
+def is_available() -> bool:
+	return _circuit_breaker.state == CircuitBreaker.CLOSED
+
+# 서킷 브레이커가 열려 있으면 확인 요청을 보낼 수 있을 때까지 기다린다 (일일 동기화 일시 정지용)
+async def wait_until_available():
+	while True:
+		delay = _circuit_breaker.retry_in()
+		if delay <= 0:
+			return
+		await asyncio.sleep(delay)
+
+# 이 블록 안에서 보내는 요청은 대화형 명령어보다 나중에 처리된다 (일일 동기화 등)
+@contextmanager
+def background_priority():
+	token = _request_priority.set(PRIORITY_BACKGROUND)
+	try:
+		yield
+	finally:
+		_request_priority.reset(token)
+
+# 이 블록 안에서 solved.ac에 보낸 요청 수를 센다 (재시도 포함, 일일 동기화 통계용)
+@contextmanager
+def count_requests():
+	counter = {"requests": 0}
+	token = _request_counter.set(counter)
+	try:
+		yield counter
+	finally:
+		_request_counter.reset(token)
+
+# 메모리 응답 캐시 통계 (캐시 크기 조정용)
+def get_cache_stats() -> dict:
+	return {**_cache_stats, "size": len(_response_cache), "inflight": len(_inflight_requests)}
+
+def clear_response_cache():
+	_response_cache.clear()
+
+# 같은 요청은 캐시된 응답을 돌려주고, 진행 중인 같은 요청이 있으면 그 결과를 함께 기다린다
 async def _fetch_api(url: str, params: dict|None, headers: dict|None):
-	loop = asyncio.get_running_loop()
+	endpoint = _endpoint_of(url)
+	ttl = ENDPOINT_CACHE_TTL.get(endpoint, 0)
+	key = (endpoint, tuple(sorted((params or {}).items())))
+
+	cached = _response_cache.get(key)
+	if cached is not None:
+		expires_at, value = cached
+		# solved.ac에 연결할 수 없으면 만료된 응답이라도 마지막으로 받은 값을 돌려준다
+		if expires_at > time.monotonic() or not is_available():
+			_response_cache.move_to_end(key)
+			_cache_stats["hits"] += 1
+			return value
+		del _response_cache[key]
+
+	inflight = _inflight_requests.get(key)
+	if inflight is not None:
+		_cache_stats["coalesced"] += 1
+		return await asyncio.shield(inflight)
+
+	_cache_stats["misses"] += 1
+	task = asyncio.ensure_future(_request(url, params, headers))
+	_inflight_requests[key] = task
+	task.add_done_callback(lambda t: _on_request_done(key, ttl, t))
+	# 요청한 쪽이 취소되어도 같은 요청을 기다리는 다른 쪽에는 영향이 없도록 shield
+	return await asyncio.shield(task)
 
-	def request_sync():
-		response = requests.get(url, headers=headers, params=params)
-		response.raise_for_status()
-		return response.json()
+def _on_request_done(key: tuple, ttl: int, task: asyncio.Future):
+	_inflight_requests.pop(key, None)
+	if task.cancelled() or task.exception() is not None or ttl <= 0:
+		return
+	_response_cache[key] = (time.monotonic() + ttl, task.result())
+	_response_cache.move_to_end(key)
+	while len(_response_cache) > RESPONSE_CACHE_SIZE:
+		_response_cache.popitem(last=False)
+		_cache_stats["evictions"] += 1
 
-	json_response = await loop.run_in_executor(None, request_sync)
-	return json_response
+async def _request(url: str, params: dict|None, headers: dict|None):
+	endpoint = _endpoint_of(url)
+	priority = _request_priority.get()
+	for attempt in range(MAX_RETRIES + 1):
+		if attempt > 0:
+			metrics.record_retry(endpoint)
+		if not _circuit_breaker.allow_request():
+			raise CircuitOpenError(f"solved.ac 요청 중단 중 ({endpoint})")
+		await _rate_limiter.acquire(priority)
+		counter = _request_counter.get()
+		if counter is not None:
+			counter["requests"] += 1
+		started = time.perf_counter()
+		try:
+			session = await open_session()
+			async with session.get(url, headers=headers, params=params) as response:
+				body = await response.read()
+				metrics.record_request(endpoint, response.status, time.perf_counter() - started, len(body))
+				if response.status >= 500:
+					_circuit_breaker.record_failure()
+				else:
+					_circuit_breaker.record_success()
+
+				if response.status not in RETRY_STATUS or attempt == MAX_RETRIES:
+					response.raise_for_status()
+					_rate_limiter.on_success()
+					return json.loads(body)
+
+				retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+				if response.status == 429:
+					_rate_limiter.on_throttled(retry_after)
+				delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+		except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+			status = "timeout" if isinstance(e, asyncio.TimeoutError) else "network"
+			metrics.record_request(endpoint, status, time.perf_counter() - started)
+			_circuit_breaker.record_failure()
+			if attempt == MAX_RETRIES:
+				raise
+			delay = _backoff_delay(attempt)
+		await asyncio.sleep(delay)
+
+def _endpoint_of(url: str) -> str:
+	return url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+
+def _backoff_delay(attempt: int) -> float:
+	return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+# Retry-After 헤더는 초 또는 HTTP 날짜 형식
+def _parse_retry_after(value: str|None) -> float|None:
+	if not value:
+		return None
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+	except (TypeError, ValueError):
+		return None
 
 # 백준 문제 번호로 문제 가져오기
 async def get_problem_from_num(problemId: int):
@@ -24,6 +384,116 @@ async def get_problem_from_num(problemId: int):
 	}
 	return await _fetch_api(url, params=querystring, headers=headers)
 
+# 여러 백준 문제를 한 번에 가져오기 ({문제 번호: 문제 정보})
+# db에 저장된 정보를 먼저 쓰고, 없는 문제만 solved.ac에서 가져와 저장한다
+async def get_problems(problem_ids: list) -> dict:
+	unique_ids = list(dict.fromkeys(int(pid) for pid in problem_ids))
+	problems = await get_cached_problems(unique_ids)
+	missing_ids = [pid for pid in unique_ids if pid not in problems]
+	async for fetched_problems in iter_fetched_problems(missing_ids):
+		problems.update(fetched_problems)
+	return problems
+
+# db에 저장된 문제 정보만 바로 반환 (solved.ac에 요청하지 않는다)
+# 오래된 정보는 그대로 반환하고 백그라운드에서 갱신한다
+async def get_cached_problems(problem_ids: list) -> dict:
+	unique_ids = list(dict.fromkeys(int(pid) for pid in problem_ids))
+	problems = await db.get_problems_info(unique_ids)
+
+	now = time.time()
+	stale_ids = []
+	for pid, problem in problems.items():
+		if now - problem['fetchedAt'] > PROBLEM_CACHE_TTL:
+			problem['stale'] = True
+			stale_ids.append(pid)
+
+	if stale_ids and is_available():
+		_schedule_problem_refresh(stale_ids)
+	return problems
+
+# solved.ac에서 문제들을 가져와 저장하고, 한 번에 조회하는 묶음이 끝날 때마다 {문제 번호: 문제 정보}를 내놓는다
+# solved.ac 장애 중이면 아무것도 내놓지 않고 끝난다
+async def iter_fetched_problems(problem_ids: list):
+	chunks = [problem_ids[i:i + LOOKUP_CHUNK_SIZE] for i in range(0, len(problem_ids), LOOKUP_CHUNK_SIZE)]
+	lookups = [asyncio.ensure_future(_lookup_problems(chunk)) for chunk in chunks]
+	try:
+		for lookup in asyncio.as_completed(lookups):
+			try:
+				items = await lookup
+			except CircuitOpenError:
+				return
+			fetched_problems = _to_problem_dict(items)
+			await db.upsert_problems(list(fetched_problems.values()))
+			yield fetched_problems
+	finally:
+		for lookup in lookups:
+			lookup.cancel()
+
+# 오래된 문제 정보를 백그라운드에서 갱신 (같은 문제는 한 번만)
+def _schedule_problem_refresh(problem_ids: list):
+	refresh_ids = [pid for pid in problem_ids if pid not in _refreshing_problem_ids]
+	if not refresh_ids:
+		return
+	_refreshing_problem_ids.update(refresh_ids)
+	task = asyncio.create_task(_refresh_problems(refresh_ids))
+	_background_tasks.add(task)
+	task.add_done_callback(_background_tasks.discard)
+
+# 명령어 처리 중에 시작되지만 응답에는 필요 없는 요청이라 명령어 몫의 요청 한도를 쓰지 않는다
+async def _refresh_problems(problem_ids: list):
+	try:
+		with background_priority():
+			fetched_problems = await _fetch_problems(problem_ids)
+		await db.upsert_problems(list(fetched_problems.values()))
+	except Exception as e:
+		print(f"_refresh_problems() Error: {e}")
+	finally:
+		_refreshing_problem_ids.difference_update(problem_ids)
+
+async def _fetch_problems(problem_ids: list) -> dict:
+	chunks = [problem_ids[i:i + LOOKUP_CHUNK_SIZE] for i in range(0, len(problem_ids), LOOKUP_CHUNK_SIZE)]
+	results = await asyncio.gather(*(_lookup_problems(chunk) for chunk in chunks))
+
+	problems = {}
+	for items in results:
+		problems.update(_to_problem_dict(items))
+	return problems
+
+def _to_problem_dict(items: list) -> dict:
+	return {
+		item['problemId']: to_problem_info(item)
+		for item in items
+		if isinstance(item, dict) and item.get('problemId') is not None
+	}
+
+async def _lookup_problems(problem_ids: list) -> list:
+	url = f"{BASE_URL}/problem/lookup"
+	querystring = {"problemIds": ",".join(str(pid) for pid in problem_ids)}
+	headers = {
+		"x-solvedac-language": "ko",
+		"Accept": "application/json"
+	}
+	result = await _fetch_api(url, params=querystring, headers=headers)
+	return result if isinstance(result, list) else []
+
+# solved.ac 문제 응답에서 캐시에 저장할 정보만 추리기
+def to_problem_info(item: dict) -> dict:
+	return {
+		'problemId': item['problemId'],
+		'titleKo': item.get('titleKo'),
+		'title': item.get('title') or _english_title(item),
+		'level': item.get('level'),
+		'tags': [tag.get('key') for tag in item.get('tags') or [] if isinstance(tag, dict)],
+		'fetchedAt': int(time.time())
+	}
+
+# titles 목록에서 영어 제목 찾기
+def _english_title(item: dict) -> str|None:
+	for title in item.get('titles') or []:
+		if isinstance(title, dict) and title.get('language') == 'en':
+			return title.get('title')
+	return None
+
 # 백준 문제 자동 완성으로 가져오기
 async def get_problem_auto_complete(string: str):
 	url = f"{BASE_URL}/search/suggestion"
@@ -49,7 +519,80 @@ async def get_user_top100(handle: str):
 	url = f"{BASE_URL}/user/top_100"
 	querystring = {"handle": handle}
 	headers = {
-    "x-solvedac-language": "ko",
-    "Accept": "application/json"
-  }
-	return await _fetch_api(url, params=querystring, headers=headers)
\ No newline at end of file
+		"x-solvedac-language": "ko",
+		"Accept": "application/json"
+	}
+	result = await _fetch_api(url, params=querystring, headers=headers)
+
+	# top 100 응답에 문제 정보가 함께 오므로 캐시에 저장해 둔다
+	items = result.get('items', []) if isinstance(result, dict) else []
+	problems = [to_problem_info(item) for item in items if isinstance(item, dict) and item.get('problemId') is not None]
+	try:
+		await db.upsert_problems(problems)
+	except Exception as e:
+		print(f"get_user_top100() 문제 정보 저장 오류: {e}")
+	return result
+
+# 핸들이 정확히 같은 사용자 정보 가져오기
+async def get_user_show(handle: str):
+	url = f"{BASE_URL}/user/show"
+	querystring = {"handle": handle}
+	headers = {
+		"x-solvedac-language": "ko",
+		"Accept": "application/json"
+	}
+	return await _fetch_api(url, params=querystring, headers=headers)
+
+# 사용자가 푼 문제 수 가져오기 (없는 사용자면 None)
+# 사용자 검색은 접두어 검색이라 짧은 핸들은 첫 페이지에 없을 수 있으므로 핸들로 바로 조회한다
+async def get_user_solved_count(handle: str) -> int|None:
+	try:
+		result = await get_user_show(handle)
+	except aiohttp.ClientResponseError as e:
+		if e.status == 404:
+			return None
+		raise
+	return result.get('solvedCount') if isinstance(result, dict) else None
+
+# 사용자가 푼 모든 문제를 페이지 단위로 가져오기 (페이지마다 문제 번호 목록을 yield)
+# known_ids를 주면 expected_new개를 찾으면 멈춘다
+# 새로 푼 문제가 아는 문제보다 번호가 작을 수 있으므로, 새 문제가 없는 페이지에서 멈추는 것은 expected_new를 모를 때만
+async def iter_user_solved_problems(handle: str, known_ids: set|None = None, expected_new: int|None = None):
+	page = 1
+	found_new = 0
+	while True:
+		result = await _search_solved_problems(handle, page)
+		items = result.get('items', []) if isinstance(result, dict) else []
+		problems = [to_problem_info(item) for item in items if isinstance(item, dict) and item.get('problemId') is not None]
+		if not problems:
+			return
+
+		try:
+			await db.upsert_problems(problems)
+		except Exception as e:
+			print(f"iter_user_solved_problems() 문제 정보 저장 오류: {e}")
+
+		problem_ids = [problem['problemId'] for problem in problems]
+		yield problem_ids
+
+		if known_ids is not None:
+			new_count = sum(1 for pid in problem_ids if pid not in known_ids)
+			found_new += new_count
+			if expected_new is not None:
+				if found_new >= expected_new:
+					return
+			elif new_count == 0:
+				return
+
+		if page * SEARCH_PAGE_SIZE >= result.get('count', 0):
+			return
+		page += 1
+
+async def _search_solved_problems(handle: str, page: int):
+	url = f"{BASE_URL}/search/problem"
+	querystring = {"query": f"solved_by:{handle}", "sort": "id", "direction": "desc", "page": str(page)}
+	headers = {
+		"x-solvedac-language": "ko",
+		"Accept": "application/json"
+	}
+	return await _fetch_api(url, params=querystring, headers=headers)
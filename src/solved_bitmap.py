@@ -0,0 +1,57 @@
+# 사용자가 푼 문제 집합을 비트맵(bytes)으로 다루는 함수들
+# 문제 번호 n이 n번째 비트 (리틀 엔디언), 백준 문제 번호가 3만 대라 사용자 한 명당 4KB 남짓
+# 합집합/교집합/차집합은 파이썬 정수 비트 연산 한 번이라 행을 훑는 것보다 훨씬 빠르다
+#
+#   mine = solved_bitmap.from_ids([1000, 1001])
+#   solved_bitmap.to_ids(solved_bitmap.difference(rival, mine))
+
+EMPTY = b""
+
+def _to_int(bitmap: bytes) -> int:
+    return int.from_bytes(bitmap, "little")
+
+def _to_bytes(value: int) -> bytes:
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+# 문제 번호 목록 -> 비트맵
+def from_ids(problem_ids) -> bytes:
+    problem_ids = [pid for pid in problem_ids if pid is not None and pid >= 0]
+    if not problem_ids:
+        return EMPTY
+    bits = bytearray(max(problem_ids) // 8 + 1)
+    for pid in problem_ids:
+        bits[pid >> 3] |= 1 << (pid & 7)
+    return bytes(bits)
+
+# 비트맵 -> 문제 번호 목록 (오름차순)
+def to_ids(bitmap: bytes) -> list:
+    problem_ids = []
+    for i, byte in enumerate(bitmap):
+        while byte:
+            lowest = byte & -byte
+            problem_ids.append(i * 8 + lowest.bit_length() - 1)
+            byte ^= lowest
+    return problem_ids
+
+def union(*bitmaps: bytes) -> bytes:
+    value = 0
+    for bitmap in bitmaps:
+        value |= _to_int(bitmap)
+    return _to_bytes(value)
+
+def intersection(first: bytes, *others: bytes) -> bytes:
+    value = _to_int(first)
+    for bitmap in others:
+        value &= _to_int(bitmap)
+    return _to_bytes(value)
+
+# first에는 있고 other에는 없는 문제
+def difference(first: bytes, other: bytes) -> bytes:
+    return _to_bytes(_to_int(first) & ~_to_int(other))
+
+def count(bitmap: bytes) -> int:
+    return _to_int(bitmap).bit_count()
+
+def contains(bitmap: bytes, problem_id: int) -> bool:
+    index = problem_id >> 3
+    return 0 <= index < len(bitmap) and bool(bitmap[index] & (1 << (problem_id & 7)))
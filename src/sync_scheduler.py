@@ -0,0 +1,228 @@
+import asyncio
+import os
+import random
+import time
+from typing import Optional
+
+import async_db as db
+import solved_ac_api as api
+
+# 푼 문제 동기화 스케줄러
+# - 사용자마다 동기화 주기가 따로 있어, 실행할 때마다 주기가 돌아온 사용자만 처리한다
+#   푼 문제가 자주 늘어나는 사용자와 그룹원/라이벌은 자주, 오래 쉬는 사용자는 점점 드물게 동기화한다
+# - 동시에 SYNC_CONCURRENCY명까지 처리하므로 느린 사용자 한 명이 전체를 붙잡지 않는다
+# - 사용자마다 시작 시각을 SYNC_WINDOW초 동안 고르게 나누고 조금씩 무작위로 어긋나게 해서 요청이 한꺼번에 몰리지 않게 한다
+# - SYNC_BATCH_SIZE명마다 결과를 한 트랜잭션으로 저장하고 처리한 사용자를 체크포인트로 남긴다
+#   봇이 중간에 재시작되면 끝나지 않은 실행의 남은 사용자부터 이어서 한다
+# - 실행마다 걸린 시간, 처리한 사용자 수, solved.ac 요청 수, 새로 푼 문제 수를 sync_runs에 기록한다
+
+SYNC_CONCURRENCY = int(os.getenv("SOL2_SYNC_CONCURRENCY", "4"))
+SYNC_WINDOW = int(os.getenv("SOL2_SYNC_WINDOW", "1800"))
+# 주기가 돌아온 사용자를 확인하는 간격(초)
+SYNC_CHECK_INTERVAL = int(os.getenv("SOL2_SYNC_CHECK_INTERVAL", "3600"))
+# 한 트랜잭션으로 저장할 사용자 수
+SYNC_BATCH_SIZE = 50
+# 명령어가 사용자의 푼 문제를 읽을 때 마지막 동기화가 이보다 오래됐으면(초) 백그라운드로 다시 동기화한다
+FRESHNESS_THRESHOLD = int(os.getenv("SOL2_FRESHNESS_THRESHOLD", "3600"))
+
+DAY = 24 * 60 * 60
+# 사용자별 동기화 주기 범위(초)
+MIN_SYNC_INTERVAL = 3 * 60 * 60
+DEFAULT_SYNC_INTERVAL = DAY
+MAX_SYNC_INTERVAL = 14 * DAY
+# 그룹원이나 라이벌이 있는 사용자는 하루보다 오래 기다리지 않고, 계산된 주기의 절반으로 동기화한다
+SOCIAL_MAX_SYNC_INTERVAL = DAY
+# 하루 평균 푼 문제 수를 구할 때 이번 결과의 비중 (지수 이동 평균)
+SOLVE_RATE_WEIGHT = 0.5
+
+_running = False
+# 명령어가 요청한 사용자별 동기화 작업 ({핸들: Task}), 같은 사용자를 동시에 두 번 동기화하지 않는다
+_refresh_tasks: dict = {}
+
+def is_running() -> bool:
+    return _running
+
+# solved.ac에서 사용자가 푼 문제 중 db에 없는 문제만 가져오기 (실패하면 None)
+# 푼 문제 수가 그대로면 검색 페이지를 아예 요청하지 않는다
+async def fetch_user_new_solved(solvedac_handle: str) -> Optional[list]:
+    try:
+        known_problems = set(await db.get_user_top100(solvedac_handle))
+        solved_count = await api.get_user_solved_count(solvedac_handle)
+        if solved_count is not None and solved_count <= len(known_problems):
+            return []
+        expected_new = solved_count - len(known_problems) if solved_count is not None else None
+
+        new_problems = []
+        async for problem_ids in api.iter_user_solved_problems(solvedac_handle, known_problems, expected_new):
+            new_problems += [pid for pid in problem_ids if pid not in known_problems]
+        return new_problems
+    except Exception as e:
+        print(f"fetch_user_new_solved Error: {e}")
+        return None
+
+# 사용자 한 명의 푼 문제를 동기화하고 새로 푼 문제를 반환
+async def sync_user_solved_problems(solvedac_handle: str) -> Optional[list]:
+    new_problems = await fetch_user_new_solved(solvedac_handle)
+    if not new_problems:
+        return new_problems
+    newly_added = await db.sync_user_problems({solvedac_handle: new_problems})
+    return newly_added.get(solvedac_handle, [])
+
+# solved.ac 장애 중에는 서킷 브레이커가 닫힐 때까지 멈췄다가 같은 사용자를 다시 시도한다
+async def _fetch_until_available(solvedac_handle: str) -> Optional[list]:
+    while True:
+        await api.wait_until_available()
+        new_problems = await fetch_user_new_solved(solvedac_handle)
+        if new_problems is not None or api.is_available() or not await db.is_user(solvedac_handle):
+            return new_problems
+
+# 이번 동기화 결과로 다음 동기화 주기 계산 (주기, 하루 평균 푼 문제 수)
+# 새로 푼 문제가 있으면 평균적으로 한 문제를 풀 때마다 한 번 동기화하도록, 없으면 주기를 두 배로 늘린다
+def next_sync_interval(schedule: dict, new_solves: int, now: float) -> tuple:
+    last_synced_at = schedule.get("last_synced_at")
+    if last_synced_at:
+        elapsed_days = max((now - last_synced_at) / DAY, 1 / 24)
+        solve_rate = SOLVE_RATE_WEIGHT * (new_solves / elapsed_days) + (1 - SOLVE_RATE_WEIGHT) * (schedule.get("solve_rate") or 0.0)
+    else:
+        # 첫 동기화는 지금까지 푼 문제 전체가 새로 푼 문제로 잡히므로 빈도 계산에서 뺀다
+        solve_rate = 0.0
+        new_solves = 0
+
+    if last_synced_at is None:
+        interval = DEFAULT_SYNC_INTERVAL
+    elif new_solves:
+        interval = DAY / solve_rate
+    else:
+        interval = (schedule.get("sync_interval") or DEFAULT_SYNC_INTERVAL) * 2
+
+    max_interval = MAX_SYNC_INTERVAL
+    if schedule.get("social"):
+        interval /= 2
+        max_interval = SOCIAL_MAX_SYNC_INTERVAL
+    return int(min(max(interval, MIN_SYNC_INTERVAL), max_interval)), solve_rate
+
+# 동기화한 사용자들의 다음 동기화 시각 저장 ({핸들: 새로 푼 문제 수})
+async def _reschedule(new_solves: dict):
+    now = time.time()
+    schedules = await db.get_sync_schedules(list(new_solves))
+    rows = []
+    for handle, schedule in schedules.items():
+        interval, solve_rate = next_sync_interval(schedule, new_solves[handle], now)
+        rows.append((handle, int(now) + interval, interval, solve_rate, int(now)))
+    await db.save_sync_schedules(rows)
+
+# 마지막 동기화가 FRESHNESS_THRESHOLD보다 오래됐으면 백그라운드로 동기화를 시작한다
+# 동기화 작업(결과는 새로 푼 문제 목록, 실패하면 None)을 반환하고, 이미 최신이거나 solved.ac에 연결할 수 없으면 None
+# 같은 사용자를 이미 동기화 중이면 그 작업을 함께 기다린다
+async def refresh_if_stale(solvedac_handle: str) -> Optional[asyncio.Task]:
+    task = _refresh_tasks.get(solvedac_handle)
+    if task is not None:
+        return task
+    if not api.is_available():
+        return None
+
+    last_synced_at = await db.get_last_synced(solvedac_handle)
+    if last_synced_at is not None and time.time() - last_synced_at < FRESHNESS_THRESHOLD:
+        return None
+
+    # db를 기다리는 사이 다른 명령어가 먼저 시작했을 수 있다
+    task = _refresh_tasks.get(solvedac_handle)
+    if task is None:
+        task = asyncio.create_task(_refresh_user(solvedac_handle))
+        _refresh_tasks[solvedac_handle] = task
+        task.add_done_callback(lambda _: _refresh_tasks.pop(solvedac_handle, None))
+    return task
+
+async def _refresh_user(solvedac_handle: str) -> Optional[list]:
+    newly_added = await sync_user_solved_problems(solvedac_handle)
+    if newly_added is not None:
+        await _reschedule({solvedac_handle: len(newly_added)})
+    return newly_added
+
+# 주기가 돌아온 사용자 동기화 (끝나지 않은 실행이 있으면 그 실행을 이어서 한다)
+# 실행 통계를 반환하고, 이미 실행 중이거나 동기화할 사용자가 없으면 None
+async def run_sync() -> Optional[dict]:
+    global _running
+    if _running:
+        return None
+    _running = True
+    try:
+        return await _run()
+    finally:
+        _running = False
+
+async def _run() -> Optional[dict]:
+    run = await db.get_unfinished_sync_run()
+    if run is None:
+        users = await db.get_users_due_for_sync(int(time.time()))
+        if not users:
+            return None
+        run_id = await db.start_sync_run(len(users))
+        started_at = time.time()
+    else:
+        run_id = run['run_id']
+        started_at = run['started_at']
+        synced = set(await db.get_synced_handles(run_id))
+        users = [user for user in await db.get_users_due_for_sync(int(time.time())) if user not in synced]
+        print(f"동기화 {run_id}번 실행을 이어서 합니다. (남은 사용자 {len(users)}명)")
+
+    # 남은 사용자를 창의 남은 시간에 나눠서 시작한다 (창이 지났으면 바로 시작)
+    window_left = max(started_at + SYNC_WINDOW - time.time(), 0)
+    spacing = window_left / len(users) if users else 0
+    loop_started = time.monotonic()
+
+    slots = asyncio.Semaphore(SYNC_CONCURRENCY)
+    flush_lock = asyncio.Lock()
+    pending_results = {}
+    pending_handles = []
+    # 가져오기에 실패한 사용자는 주기를 바꾸지 않아 다음 실행에서 다시 시도한다
+    pending_succeeded = []
+    reported_calls = 0
+
+    with api.background_priority(), api.count_requests() as counter:
+        async def flush():
+            nonlocal reported_calls
+            async with flush_lock:
+                results = dict(pending_results)
+                handles = list(pending_handles)
+                succeeded = list(pending_succeeded)
+                pending_results.clear()
+                pending_handles.clear()
+                pending_succeeded.clear()
+                api_calls = counter["requests"] - reported_calls
+                reported_calls = counter["requests"]
+                if not handles:
+                    return
+                newly_added = await db.sync_user_problems(results) if results else {}
+                new_solves = sum(len(problem_ids) for problem_ids in newly_added.values())
+                if succeeded:
+                    await _reschedule({handle: len(newly_added.get(handle, [])) for handle in succeeded})
+                await db.checkpoint_sync_run(run_id, handles, api_calls, new_solves)
+
+        async def sync_one(index: int, solvedac_handle: str):
+            start_at = loop_started + index * spacing + random.uniform(0, spacing)
+            await asyncio.sleep(max(start_at - time.monotonic(), 0))
+            try:
+                async with slots:
+                    new_problems = await _fetch_until_available(solvedac_handle)
+                if new_problems:
+                    pending_results[solvedac_handle] = new_problems
+                if new_problems is not None:
+                    pending_succeeded.append(solvedac_handle)
+                pending_handles.append(solvedac_handle)
+                if len(pending_handles) >= SYNC_BATCH_SIZE:
+                    await flush()
+            except Exception as e:
+                print(f"sync_one({solvedac_handle}) Error: {e}")
+
+        await asyncio.gather(*(sync_one(index, user) for index, user in enumerate(users)))
+        await flush()
+
+    await db.finish_sync_run(run_id)
+    stats = (await db.get_recent_sync_runs(1))[0]
+    print(
+        f"동기화 {run_id}번 완료: {stats['finished_at'] - stats['started_at']}초, "
+        f"사용자 {stats['users_processed']}/{stats['users_total']}명, "
+        f"solved.ac 요청 {stats['api_calls']}회, 새로 푼 문제 {stats['new_solves']}개"
+    )
+    return stats